@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Testing scripts.
+
+Configuration, MCP server and Kafka client instances are cached per
+config path so scripts running in the same process reuse one set of
+connections instead of re-parsing YAML and re-authenticating each time.
+"""
+
+import asyncio
+import atexit
+import heapq
+import json
+import logging
+import queue
+import sys
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the installed package (pip install -e ..); only fall back to the
+# src directory when it is not installed
+try:
+    import cdf_kafka_mcp_server  # noqa: F401
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cdf_kafka_mcp_server.config import Config, load_config
+from cdf_kafka_mcp_server.cdp_kafka_client import CDPKafkaClient
+from cdf_kafka_mcp_server.kafka_client import KafkaClient
+from cdf_kafka_mcp_server.mcp_server import CDFKafkaMCPServer
+from mcp.types import CallToolRequest, CallToolResult
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a logger whose output is written to stdout by a background thread.
+    
+    Records are handed to a queue and written by a QueueListener, so logging
+    from a coroutine never blocks the event loop on a stdout write. The
+    listener is flushed and stopped at interpreter exit.
+    """
+    global _log_listener
+    if _log_listener is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _log_listener = QueueListener(_log_queue, handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(QueueHandler(_log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+@lru_cache(maxsize=None)
+def get_config(config_path: str) -> Config:
+    """Load and cache the configuration for a config path."""
+    return load_config(config_path)
+
+
+@lru_cache(maxsize=None)
+def get_server(config_path: str) -> CDFKafkaMCPServer:
+    """Create and cache an MCP server for a config path."""
+    return CDFKafkaMCPServer(config_path)
+
+
+@asynccontextmanager
+async def mcp_session(config_path: str) -> AsyncIterator[CDFKafkaMCPServer]:
+    """Async context yielding the cached MCP server for a config path.
+    
+    The server outlives the context so chained scripts keep reusing it.
+    """
+    yield get_server(config_path)
+
+
+@lru_cache(maxsize=None)
+def get_client(config_path: str) -> CDPKafkaClient:
+    """Create and cache a CDP Kafka client for a config path."""
+    return CDPKafkaClient(get_config(config_path))
+
+
+@lru_cache(maxsize=None)
+def get_kafka_client(config_path: str) -> KafkaClient:
+    """Create and cache a native Kafka client for a config path.
+    
+    The admin client, producer and consumer inside it are bootstrapped once
+    (SASL/SSL handshake plus metadata fetch) and closed at interpreter exit.
+    """
+    client = KafkaClient(get_config(config_path))
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=None)
+def _cached_tool_request(name: str, arguments: Tuple[Tuple[str, Any], ...]) -> CallToolRequest:
+    return CallToolRequest(params={'name': name, 'arguments': dict(arguments)})
+
+
+def tool_request(name: str, **arguments: Any) -> CallToolRequest:
+    """Build a CallToolRequest, reusing a cached instance for hashable arguments."""
+    try:
+        return _cached_tool_request(name, tuple(sorted(arguments.items())))
+    except TypeError:
+        # Unhashable argument values (dicts, lists) are built fresh each time
+        return CallToolRequest(params={'name': name, 'arguments': arguments})
+
+
+# Prebuilt requests for the argument-less tools the scripts call most
+TEST_CONNECTION_REQ = tool_request('test_connection')
+LIST_TOPICS_REQ = tool_request('list_topics')
+LIST_CONNECTORS_REQ = tool_request('list_connectors')
+
+
+async def call_tools(server: CDFKafkaMCPServer, requests: Sequence[CallToolRequest],
+                     timeout: float = 5.0) -> List[Union[CallToolResult, BaseException]]:
+    """Run independent tool calls concurrently with a per-call timeout.
+    
+    Results come back in request order. A call that runs past its timeout
+    yields TimeoutError without affecting the others. Any other failure is
+    treated as fatal: the calls still running are cancelled and report
+    CancelledError.
+    
+    Cancelling only stops waiting for a call; a tool handler that runs
+    blocking client code in a worker thread keeps running there until it
+    returns.
+    """
+    async def bounded(request: CallToolRequest) -> Union[CallToolResult, BaseException]:
+        try:
+            return await asyncio.wait_for(server.call_tool(request), timeout)
+        except asyncio.TimeoutError as e:
+            return e
+    
+    tasks = [asyncio.ensure_future(bounded(request)) for request in requests]
+    if not tasks:
+        return []
+    
+    _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    
+    return [asyncio.CancelledError() if task.cancelled() else (task.exception() or task.result())
+            for task in tasks]
+
+
+def format_topics(topics: Iterable[str], limit: int = 50) -> str:
+    """Render a topic list for display, showing at most `limit` names.
+    
+    The `limit` alphabetically smallest names are shown, in sorted order
+    (heapq.nsmallest), so a cluster with hundreds of thousands of topics is
+    never fully sorted.
+    """
+    topics = list(topics)
+    shown = heapq.nsmallest(limit, topics)
+    text = ', '.join(shown)
+    if len(topics) > limit:
+        text += f" ... ({len(topics) - limit} more)"
+    return text
+
+
+def parse_result(result: CallToolResult) -> Dict[str, Any]:
+    """Decode the JSON payload of a tool result, using orjson when installed."""
+    text = result.content[0].text
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine, using uvloop as the event loop when it is installed."""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)
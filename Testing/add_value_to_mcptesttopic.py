@@ -4,116 +4,120 @@ Add a value to mcptesttopic using CDP Kafka client
 """
 
 import asyncio
-import sys
-import os
 import json
 import time
-from typing import Dict, Any
-
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from typing import Dict, Any, Optional
 
+from _common import format_topics, get_client, get_logger, run
 from cdf_kafka_mcp_server.cdp_kafka_client import CDPKafkaClient
-from cdf_kafka_mcp_server.config import load_config
 
-async def add_value_to_topic():
-    """Add a value to mcptesttopic."""
-    print("🚀 Adding value to mcptesttopic")
-    print("=" * 50)
+log = get_logger(__name__)
+
+CONFIG_PATH = '../config/kafka_config_cdp_optimized.yaml'
+PROBE_TIMEOUT = 5.0
+
+
+async def add_value_to_topic(client: Optional[CDPKafkaClient] = None) -> bool:
+    """Add a value to mcptesttopic.
+    
+    Args:
+        client: CDP Kafka client to reuse; one is created from CONFIG_PATH if omitted
+    
+    Returns:
+        True if the message was produced
+    """
+    log.info("🚀 Adding value to mcptesttopic")
+    log.info("=" * 50)
     
+    produced = False
     try:
-        # Load configuration
-        config = load_config('../config/kafka_config_cdp_optimized.yaml')
-        
         # Initialize CDP Kafka client
-        print("🔧 Initializing CDP Kafka client...")
-        client = CDPKafkaClient(config)
+        if client is None:
+            log.info("🔧 Initializing CDP Kafka client...")
+            client = get_client(CONFIG_PATH)
         
-        # Test connection
-        print("🔍 Testing connection...")
-        connection_result = client.test_connection()
-        print(f"Connection: {connection_result.get('connected', False)}")
-        print(f"Message: {connection_result.get('message', 'No message')}")
+        # Test connection and list topics concurrently (both are read-only).
+        # The timeout only bounds how long we wait: a probe that overruns
+        # keeps running in its worker thread
+        log.info("🔍 Testing connection and listing topics...")
+        connection_result, topics = await asyncio.gather(
+            asyncio.wait_for(asyncio.to_thread(client.test_connection), PROBE_TIMEOUT),
+            asyncio.wait_for(asyncio.to_thread(client.list_topics), PROBE_TIMEOUT),
+            return_exceptions=True
+        )
         
-        # Create topic if it doesn't exist
-        print("\n🔧 Creating topic if it doesn't exist...")
-        try:
-            topic_result = await client.create_topic(
-                name='mcptesttopic',
-                partitions=1,
-                replication_factor=1
-            )
-            print(f"Topic creation result: {topic_result}")
-        except Exception as e:
-            print(f"Topic creation failed (may already exist): {e}")
+        if isinstance(connection_result, Exception):
+            log.info(f"Connection test failed: {connection_result}")
+        else:
+            log.info(f"Connection: {connection_result.get('connected', False)}")
+            log.info(f"Message: {connection_result.get('message', 'No message')}")
         
-        # List topics to verify
-        print("\n🔍 Listing topics...")
-        try:
-            topics = await client.list_topics()
-            print(f"Available topics: {topics}")
-        except Exception as e:
-            print(f"Failed to list topics: {e}")
+        if isinstance(topics, Exception):
+            log.info(f"Failed to list topics: {topics}")
+        else:
+            log.info(f"Available topics: {format_topics(topics)}")
+        
+        # Create topic if it doesn't exist, reusing the listing above
+        if not isinstance(topics, Exception) and 'mcptesttopic' in client.topic_names():
+            log.info("\n✅ Topic mcptesttopic already exists, skipping creation")
+        else:
+            log.info("\n🔧 Creating topic if it doesn't exist...")
+            try:
+                topic_result = await asyncio.to_thread(
+                    client.create_topic,
+                    name='mcptesttopic',
+                    partitions=1,
+                    replication_factor=1
+                )
+                log.info(f"Topic creation result: {topic_result}")
+            except Exception as e:
+                log.info(f"Topic creation failed (may already exist): {e}")
         
         # Produce message
-        print("\n📝 Producing message to mcptesttopic...")
+        log.info("\n📝 Producing message to mcptesttopic...")
         try:
-            message_data = {
-                'topic': 'mcptesttopic',
-                'key': 'test-key-1',
-                'value': f'Hello from MCP Server! Timestamp: {int(time.time())}',
-                'headers': {
-                    'source': 'mcp-server',
-                    'timestamp': str(int(time.time())),
-                    'version': '1.0'
-                }
-            }
-            
-            result = await client.produce_message(
+            # Take the timestamp once so the value and header agree
+            ts = int(time.time())
+            result = await asyncio.to_thread(
+                client.produce_message,
                 topic='mcptesttopic',
                 key='test-key-1',
-                value=f'Hello from MCP Server! Timestamp: {int(time.time())}',
+                value=f'Hello from MCP Server! Timestamp: {ts}',
                 headers={
                     'source': 'mcp-server',
-                    'timestamp': str(int(time.time())),
+                    'timestamp': str(ts),
                     'version': '1.0'
                 }
             )
             
-            print(f"✅ Message produced successfully!")
-            print(f"Result: {result}")
+            produced = bool(result)
+            if produced:
+                log.info("✅ Message produced successfully!")
+            else:
+                log.info("❌ Failed to produce message")
             
         except Exception as e:
-            print(f"❌ Failed to produce message: {e}")
-            
-            # Try with minimal parameters
-            print("\n🔄 Trying with minimal parameters...")
-            try:
-                result = await client.produce_message(
-                    topic='mcptesttopic',
-                    value=f'Simple message from MCP Server at {int(time.time())}'
-                )
-                print(f"✅ Simple message produced: {result}")
-            except Exception as e2:
-                print(f"❌ Simple message also failed: {e2}")
+            log.info(f"❌ Failed to produce message: {e}")
         
         # Consume messages to verify
-        print("\n🔍 Consuming messages to verify...")
+        log.info("\n🔍 Consuming messages to verify...")
         try:
-            messages = await client.consume_messages(
+            messages = await asyncio.to_thread(
+                client.consume_bulk,
                 topic='mcptesttopic',
                 max_messages=5
             )
-            print(f"Consumed messages: {len(messages)}")
+            log.info(f"Consumed messages: {len(messages)}")
             for i, msg in enumerate(messages):
-                print(f"  Message {i+1}: {msg}")
+                log.info(f"  Message {i+1}: {msg}")
         except Exception as e:
-            print(f"Failed to consume messages: {e}")
+            log.info(f"Failed to consume messages: {e}")
         
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ Error: {e}")
+    
+    return produced
+
 
 if __name__ == "__main__":
-    asyncio.run(add_value_to_topic())
+    run(add_value_to_topic())
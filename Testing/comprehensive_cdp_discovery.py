@@ -3,40 +3,344 @@
 Comprehensive CDP Service Discovery Script
 """
 
+import argparse
+import base64
 import requests
 import json
 import time
 import sys
 import os
-from typing import Dict, List, Any, Optional
+import re
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin
 
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+# Number of endpoint probes run concurrently
+PROBE_WORKERS = 32
+
+# Keep-alive connections held per host; larger than PROBE_WORKERS so no
+# probe ever has to open (and TLS-handshake) a throwaway connection
+POOL_MAXSIZE = 64
+
+# Bytes of each probe response read for classification and preview
+PROBE_BODY_BYTES = 4096
+
+# Unread bytes drained from a probe response so its connection can be
+# reused; anything longer is closed instead
+DRAIN_BYTES = 64 * 1024
+
+# (connect, read) timeouts per probe, and how many consecutive connect
+# timeouts mark the host as dead so the remaining probes fail fast
+PROBE_TIMEOUT = (2, 5)
+CONNECT_FAILURE_LIMIT = 3
+
+# HEAD statuses that warrant a follow-up GET: success, or HEAD not supported
+GET_AFTER_HEAD_STATUSES = (200, 405, 501)
+
+# On-disk cache of probe results so repeated runs skip the network; kept
+# in the user's cache directory since it holds response previews and headers
+PROBE_CACHE_FILE = os.path.join(os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                                'cdf-kafka-mcp-server', 'cdp_probe_cache.json')
+PROBE_CACHE_TTL = 300  # seconds
+
+# Response headers worth keeping in the discovery results
+INTERESTING_HEADERS = ('content-type', 'content-length', 'server', 'www-authenticate', 'location')
+
+# Comprehensive service patterns to probe, as (path, description)
+RAW_SERVICE_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    # Base CDP patterns
+    ("/", "Root"),
+    ("/api", "API Root"),
+    ("/health", "Health Check"),
+    ("/info", "Info"),
+    ("/status", "Status"),
+    
+    # CDP Proxy patterns
+    ("/irb-kakfa-only", "CDP Base"),
+    ("/irb-kakfa-only/", "CDP Base with slash"),
+    ("/irb-kakfa-only/cdp-proxy", "CDP Proxy"),
+    ("/irb-kakfa-only/cdp-proxy/", "CDP Proxy with slash"),
+    ("/irb-kakfa-only/cdp-proxy-api", "CDP Proxy API"),
+    ("/irb-kakfa-only/cdp-proxy-api/", "CDP Proxy API with slash"),
+    ("/irb-kakfa-only/cdp-proxy-token", "CDP Proxy Token"),
+    ("/irb-kakfa-only/cdp-proxy-token/", "CDP Proxy Token with slash"),
+    
+    # Kafka REST API patterns
+    ("/irb-kakfa-only/cdp-proxy-api/kafka-rest", "Kafka REST via CDP Proxy API"),
+    ("/irb-kakfa-only/cdp-proxy/kafka-rest", "Kafka REST via CDP Proxy"),
+    ("/irb-kakfa-only/kafka-rest", "Kafka REST Direct"),
+    ("/irb-kakfa-only/kafka/rest", "Kafka REST Alternative"),
+    ("/irb-kakfa-only/rest", "REST Short"),
+    ("/kafka-rest", "Kafka REST Root"),
+    ("/rest", "REST Root"),
+    
+    # Kafka Connect patterns
+    ("/irb-kakfa-only/cdp-proxy-api/kafka-connect", "Kafka Connect via CDP Proxy API"),
+    ("/irb-kakfa-only/cdp-proxy/kafka-connect", "Kafka Connect via CDP Proxy"),
+    ("/irb-kakfa-only/kafka-connect", "Kafka Connect Direct"),
+    ("/irb-kakfa-only/kafka/connect", "Kafka Connect Alternative"),
+    ("/irb-kakfa-only/connect", "Connect Short"),
+    ("/kafka-connect", "Kafka Connect Root"),
+    ("/connect", "Connect Root"),
+    
+    # Kafka Topics patterns
+    ("/irb-kakfa-only/cdp-proxy-api/kafka-topics", "Kafka Topics via CDP Proxy API"),
+    ("/irb-kakfa-only/cdp-proxy/kafka-topics", "Kafka Topics via CDP Proxy"),
+    ("/irb-kakfa-only/kafka-topics", "Kafka Topics Direct"),
+    ("/irb-kakfa-only/kafka/topics", "Kafka Topics Alternative"),
+    ("/irb-kakfa-only/topics", "Topics Short"),
+    ("/kafka-topics", "Kafka Topics Root"),
+    ("/topics", "Topics Root"),
+    
+    # Knox Gateway patterns
+    ("/irb-kakfa-only/knox-gateway", "Knox Gateway"),
+    ("/irb-kakfa-only/knox", "Knox"),
+    ("/irb-kakfa-only/gateway", "Gateway"),
+    ("/irb-kakfa-only/cdp-proxy-token/knox", "Knox via CDP Proxy Token"),
+    ("/irb-kakfa-only/cdp-proxy-token/gateway", "Gateway via CDP Proxy Token"),
+    ("/knox-gateway", "Knox Gateway Root"),
+    ("/knox", "Knox Root"),
+    ("/gateway", "Gateway Root"),
+    
+    # SMM patterns
+    ("/irb-kakfa-only/smm", "SMM"),
+    ("/irb-kakfa-only/smm-api", "SMM API"),
+    ("/irb-kakfa-only/streams-messaging-manager", "SMM Full"),
+    ("/irb-kakfa-only/cdp-proxy-api/smm", "SMM via CDP Proxy API"),
+    ("/irb-kakfa-only/cdp-proxy/smm", "SMM via CDP Proxy"),
+    ("/smm", "SMM Root"),
+    ("/smm-api", "SMM API Root"),
+    
+    # Admin patterns
+    ("/irb-kakfa-only/admin", "Admin"),
+    ("/irb-kakfa-only/api", "API"),
+    ("/irb-kakfa-only/management", "Management"),
+    ("/irb-kakfa-only/cdp-proxy-api/admin", "Admin via CDP Proxy API"),
+    ("/irb-kakfa-only/cdp-proxy/admin", "Admin via CDP Proxy"),
+    ("/admin", "Admin Root"),
+    ("/api", "API Root"),
+    ("/management", "Management Root"),
+    
+    # CDP specific patterns
+    ("/irb-kakfa-only/cdp", "CDP"),
+    ("/irb-kakfa-only/cdp-api", "CDP API"),
+    ("/irb-kakfa-only/cdp-management", "CDP Management"),
+    ("/cdp", "CDP Root"),
+    ("/cdp-api", "CDP API Root"),
+    
+    # Cloudera patterns
+    ("/irb-kakfa-only/cloudera", "Cloudera"),
+    ("/irb-kakfa-only/cloudera-api", "Cloudera API"),
+    ("/cloudera", "Cloudera Root"),
+    ("/cloudera-api", "Cloudera API Root"),
+    
+    # DataHub patterns
+    ("/irb-kakfa-only/datahub", "DataHub"),
+    ("/irb-kakfa-only/datahub-api", "DataHub API"),
+    ("/datahub", "DataHub Root"),
+    ("/datahub-api", "DataHub API Root"),
+    
+    # Additional patterns
+    ("/irb-kakfa-only/services", "Services"),
+    ("/irb-kakfa-only/endpoints", "Endpoints"),
+    ("/irb-kakfa-only/apis", "APIs"),
+    ("/services", "Services Root"),
+    ("/endpoints", "Endpoints Root"),
+    ("/apis", "APIs Root")
+)
+
+
+def _dedupe_patterns(patterns: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, str], ...]:
+    """Drop duplicate paths and trailing-slash variants, keeping the first description."""
+    unique = {}
+    for path, description in patterns:
+        normalized = path.rstrip('/') or '/'
+        unique.setdefault(normalized, (normalized, description))
+    return tuple(unique.values())
+
+
+SERVICE_PATTERNS: Tuple[Tuple[str, str], ...] = _dedupe_patterns(RAW_SERVICE_PATTERNS)
+
+
+def _pattern_parents(patterns: Tuple[Tuple[str, str], ...]) -> Dict[str, Optional[str]]:
+    """Map each path to its nearest ancestor that is itself a probed pattern.
+
+    Single-segment prefixes never gate their children: a Knox gateway context
+    such as /gateway usually 404s even though its topologies are served.
+    """
+    known = {path for path, _ in patterns}
+    parents = {}
+    for path, _ in patterns:
+        parent = None
+        prefix = path
+        while prefix.count('/') > 2:
+            prefix = prefix.rsplit('/', 1)[0]
+            if prefix in known:
+                parent = prefix
+                break
+        parents[path] = parent
+    return parents
+
+
+# Probe order is by parent depth so a hard 404 on a prefix can prune its subtree
+PATTERN_PARENTS: Dict[str, Optional[str]] = _pattern_parents(SERVICE_PATTERNS)
+
+# Service indicator keywords, one named group per category, matched in a
+# single case-insensitive pass over the response body
+KEYWORD_RE = re.compile(
+    r'(?P<kafka>kafka|broker|topic|partition)'
+    r'|(?P<connect>connect|connector|plugin)'
+    r'|(?P<knox>knox|gateway|token|auth)'
+    r'|(?P<admin>admin|management|api|service)'
+    r'|(?P<cdp>cdp|cloudera|data platform)',
+    re.IGNORECASE
+)
+
+# Path tokens per category, checked in priority order; a service's primary
+# bucket is the first category whose indicator flag or path token matches
+KAFKA_TOKENS = ('kafka',)
+CONNECT_TOKENS = ('connect',)
+KNOX_TOKENS = ('knox', 'gateway')
+ADMIN_TOKENS = ('admin', 'api')
+CDP_TOKENS = ('cdp',)
+
+CATEGORY_RULES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ('kafka_services', 'is_kafka_related', KAFKA_TOKENS),
+    ('connect_services', 'is_connect_related', CONNECT_TOKENS),
+    ('knox_services', 'is_knox_related', KNOX_TOKENS),
+    ('admin_services', 'is_admin_related', ADMIN_TOKENS),
+    ('cdp_services', 'is_cdp_related', CDP_TOKENS),
+)
+
+
+@lru_cache(maxsize=8)
+def _basic_auth(username: str, password: str) -> str:
+    """Build (once per credential pair) the HTTP Basic Authorization header value."""
+    return 'Basic ' + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+def _release(response: requests.Response) -> None:
+    """Finish with a streamed response so its keep-alive connection is reused.
+    
+    The unread rest of the body is drained when it is at most DRAIN_BYTES,
+    which hands the connection back to the pool; a longer (or broken) body
+    costs more to read than a new connection, so the connection is closed.
+    """
+    raw = response.raw
+    try:
+        remaining = getattr(raw, 'length_remaining', None)
+        drained = 0
+        while (remaining is None or remaining <= DRAIN_BYTES) and drained <= DRAIN_BYTES:
+            chunk = raw.read(16384, decode_content=True)
+            if not chunk:
+                raw.release_conn()
+                return
+            drained += len(chunk)
+    except Exception:
+        pass
+    response.close()
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use TCP_NODELAY and SO_KEEPALIVE."""
+    
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
 class ComprehensiveCDPDiscovery:
     """Comprehensive CDP service discovery."""
     
-    def __init__(self, base_url: str, username: str, password: str):
+    def __init__(self, base_url: str, username: str, password: str, use_cache: bool = True,
+                 prune_subpaths: bool = True):
         self.base_url = base_url.rstrip('/')
         self.username = username
         self.password = password
         self.session = requests.Session()
         self.discovered_services = {}
         
+        # Probe result cache keyed by URL, shared by the probe threads. Results
+        # depend on who is asking, so the file holds one such cache per
+        # (base URL, username)
+        self._cache_key = f"{self.username}@{self.base_url}"
+        self._cache = self._load_cache() if use_cache else None
+        self.prune_subpaths = prune_subpaths
+        self._cache_lock = threading.Lock()
+        
+        # Consecutive connect timeouts; once the limit is hit the host is dead
+        self._connect_failures = 0
+        self._host_dead = False
+        
         # Setup authentication
         self._setup_auth()
     
+    @staticmethod
+    def _read_cache_file() -> Dict[str, Any]:
+        """Read every cached (base URL, username) entry from the cache file."""
+        try:
+            with open(PROBE_CACHE_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load this base URL and user's unexpired probe results from the cache file."""
+        cache = self._read_cache_file().get(self._cache_key, {})
+        now = time.time()
+        return {url: entry for url, entry in cache.items() if now - entry.get('ts', 0) < PROBE_CACHE_TTL}
+    
+    def _save_cache(self):
+        """Persist the probe result cache, readable only by the current user."""
+        if self._cache is None:
+            return
+        try:
+            caches = self._read_cache_file()
+            caches[self._cache_key] = self._cache
+            os.makedirs(os.path.dirname(PROBE_CACHE_FILE), exist_ok=True)
+            with open(PROBE_CACHE_FILE, 'w', opener=lambda path, flags: os.open(path, flags, 0o600)) as f:
+                json.dump(caches, f)
+        except OSError as e:
+            print(f"⚠️ Could not write probe cache: {e}")
+    
     def _setup_auth(self):
         """Setup authentication for CDP services."""
-        import base64
-        credentials = f"{self.username}:{self.password}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        
         self.session.headers.update({
-            'Authorization': f'Basic {encoded_credentials}',
+            'Authorization': _basic_auth(self.username, self.password),
             'Accept': 'application/json',
-            'Content-Type': 'application/json',
-            'User-Agent': 'CDF-Kafka-MCP-Server/1.0'
+            'User-Agent': 'CDF-Kafka-MCP-Server/1.0',
+            'Connection': 'keep-alive'
         })
         
+        # All probes hit one host, so a few pools with many keep-alive
+        # connections each let every probe reuse an established TLS session
+        adapter = KeepAliveAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Disable SSL warnings
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -49,147 +353,120 @@ class ComprehensiveCDPDiscovery:
         
         all_services = {}
         
-        # Test comprehensive service patterns
-        service_patterns = [
-            # Base CDP patterns
-            ("/", "Root"),
-            ("/api", "API Root"),
-            ("/health", "Health Check"),
-            ("/info", "Info"),
-            ("/status", "Status"),
-            
-            # CDP Proxy patterns
-            ("/irb-kakfa-only", "CDP Base"),
-            ("/irb-kakfa-only/", "CDP Base with slash"),
-            ("/irb-kakfa-only/cdp-proxy", "CDP Proxy"),
-            ("/irb-kakfa-only/cdp-proxy/", "CDP Proxy with slash"),
-            ("/irb-kakfa-only/cdp-proxy-api", "CDP Proxy API"),
-            ("/irb-kakfa-only/cdp-proxy-api/", "CDP Proxy API with slash"),
-            ("/irb-kakfa-only/cdp-proxy-token", "CDP Proxy Token"),
-            ("/irb-kakfa-only/cdp-proxy-token/", "CDP Proxy Token with slash"),
-            
-            # Kafka REST API patterns
-            ("/irb-kakfa-only/cdp-proxy-api/kafka-rest", "Kafka REST via CDP Proxy API"),
-            ("/irb-kakfa-only/cdp-proxy/kafka-rest", "Kafka REST via CDP Proxy"),
-            ("/irb-kakfa-only/kafka-rest", "Kafka REST Direct"),
-            ("/irb-kakfa-only/kafka/rest", "Kafka REST Alternative"),
-            ("/irb-kakfa-only/rest", "REST Short"),
-            ("/kafka-rest", "Kafka REST Root"),
-            ("/rest", "REST Root"),
-            
-            # Kafka Connect patterns
-            ("/irb-kakfa-only/cdp-proxy-api/kafka-connect", "Kafka Connect via CDP Proxy API"),
-            ("/irb-kakfa-only/cdp-proxy/kafka-connect", "Kafka Connect via CDP Proxy"),
-            ("/irb-kakfa-only/kafka-connect", "Kafka Connect Direct"),
-            ("/irb-kakfa-only/kafka/connect", "Kafka Connect Alternative"),
-            ("/irb-kakfa-only/connect", "Connect Short"),
-            ("/kafka-connect", "Kafka Connect Root"),
-            ("/connect", "Connect Root"),
-            
-            # Kafka Topics patterns
-            ("/irb-kakfa-only/cdp-proxy-api/kafka-topics", "Kafka Topics via CDP Proxy API"),
-            ("/irb-kakfa-only/cdp-proxy/kafka-topics", "Kafka Topics via CDP Proxy"),
-            ("/irb-kakfa-only/kafka-topics", "Kafka Topics Direct"),
-            ("/irb-kakfa-only/kafka/topics", "Kafka Topics Alternative"),
-            ("/irb-kakfa-only/topics", "Topics Short"),
-            ("/kafka-topics", "Kafka Topics Root"),
-            ("/topics", "Topics Root"),
-            
-            # Knox Gateway patterns
-            ("/irb-kakfa-only/knox-gateway", "Knox Gateway"),
-            ("/irb-kakfa-only/knox", "Knox"),
-            ("/irb-kakfa-only/gateway", "Gateway"),
-            ("/irb-kakfa-only/cdp-proxy-token/knox", "Knox via CDP Proxy Token"),
-            ("/irb-kakfa-only/cdp-proxy-token/gateway", "Gateway via CDP Proxy Token"),
-            ("/knox-gateway", "Knox Gateway Root"),
-            ("/knox", "Knox Root"),
-            ("/gateway", "Gateway Root"),
-            
-            # SMM patterns
-            ("/irb-kakfa-only/smm", "SMM"),
-            ("/irb-kakfa-only/smm-api", "SMM API"),
-            ("/irb-kakfa-only/streams-messaging-manager", "SMM Full"),
-            ("/irb-kakfa-only/cdp-proxy-api/smm", "SMM via CDP Proxy API"),
-            ("/irb-kakfa-only/cdp-proxy/smm", "SMM via CDP Proxy"),
-            ("/smm", "SMM Root"),
-            ("/smm-api", "SMM API Root"),
-            
-            # Admin patterns
-            ("/irb-kakfa-only/admin", "Admin"),
-            ("/irb-kakfa-only/api", "API"),
-            ("/irb-kakfa-only/management", "Management"),
-            ("/irb-kakfa-only/cdp-proxy-api/admin", "Admin via CDP Proxy API"),
-            ("/irb-kakfa-only/cdp-proxy/admin", "Admin via CDP Proxy"),
-            ("/admin", "Admin Root"),
-            ("/api", "API Root"),
-            ("/management", "Management Root"),
-            
-            # CDP specific patterns
-            ("/irb-kakfa-only/cdp", "CDP"),
-            ("/irb-kakfa-only/cdp-api", "CDP API"),
-            ("/irb-kakfa-only/cdp-management", "CDP Management"),
-            ("/cdp", "CDP Root"),
-            ("/cdp-api", "CDP API Root"),
-            
-            # Cloudera patterns
-            ("/irb-kakfa-only/cloudera", "Cloudera"),
-            ("/irb-kakfa-only/cloudera-api", "Cloudera API"),
-            ("/cloudera", "Cloudera Root"),
-            ("/cloudera-api", "Cloudera API Root"),
-            
-            # DataHub patterns
-            ("/irb-kakfa-only/datahub", "DataHub"),
-            ("/irb-kakfa-only/datahub-api", "DataHub API"),
-            ("/datahub", "DataHub Root"),
-            ("/datahub-api", "DataHub API Root"),
-            
-            # Additional patterns
-            ("/irb-kakfa-only/services", "Services"),
-            ("/irb-kakfa-only/endpoints", "Endpoints"),
-            ("/irb-kakfa-only/apis", "APIs"),
-            ("/services", "Services Root"),
-            ("/endpoints", "Endpoints Root"),
-            ("/apis", "APIs Root")
-        ]
+        # Probe endpoints concurrently, one tree level per round, so children of
+        # a prefix that answered a hard 404 are skipped instead of probed
+        descriptions = dict(SERVICE_PATTERNS)
+        pending = [path for path, _ in SERVICE_PATTERNS]
+        dead = set()
+        with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+            while pending:
+                ready = [path for path in pending if PATTERN_PARENTS[path] not in pending]
+                pending = [path for path in pending if path not in ready]
+                futures = {}
+                for path in ready:
+                    parent = PATTERN_PARENTS[path]
+                    if self.prune_subpaths and (parent in dead or parent in all_services and
+                                                all_services[parent].get('skipped')):
+                        all_services[path] = self._skipped_status(path, descriptions[path], parent)
+                        continue
+                    url = urljoin(self.base_url, path)
+                    futures[executor.submit(self._test_endpoint, url, descriptions[path])] = path
+                
+                for future in as_completed(futures):
+                    path = futures[future]
+                    status = future.result()
+                    all_services[path] = status
+                    if status['status_code'] == 404 and 'www-authenticate' not in status['headers']:
+                        dead.add(path)
+                    
+                    # Print interesting results as they arrive
+                    if status['available'] and status['status_code'] in [200, 401, 403]:
+                        print(f"✅ {status['description']}: {status['status_code']} ({status['content_type']})")
+                        if status['response_preview']:
+                            print(f"   Preview: {status['response_preview'][:100]}...")
         
-        for path, description in service_patterns:
-            full_url = urljoin(self.base_url, path)
-            status = self._test_endpoint(full_url, description)
-            all_services[path] = status
-            
-            # Print interesting results immediately
-            if status['available'] and status['status_code'] in [200, 401, 403]:
-                print(f"✅ {description}: {status['status_code']} ({status['content_type']})")
-                if status['response_preview']:
-                    print(f"   Preview: {status['response_preview'][:100]}...")
+        skipped = sum(1 for status in all_services.values() if status.get('skipped'))
+        if skipped:
+            print(f"⏭️  Skipped {skipped} endpoints under prefixes that returned 404")
         
-        self.discovered_services = all_services
+        # Keep results in pattern order regardless of completion order
+        self.discovered_services = {path: all_services[path] for path, _ in SERVICE_PATTERNS}
+        self._save_cache()
+        all_services = self.discovered_services
         return all_services
     
+    @staticmethod
+    def _match_indicators(text: str) -> set:
+        """Return the indicator categories whose keywords appear in text."""
+        found = set()
+        for match in KEYWORD_RE.finditer(text):
+            found.add(match.lastgroup)
+            if len(found) == len(KEYWORD_RE.groupindex):
+                break
+        return found
+    
     def _test_endpoint(self, url: str, description: str) -> Dict[str, Any]:
+        """Test a specific endpoint, reusing a cached result when it is fresh."""
+        if self._cache is not None:
+            with self._cache_lock:
+                entry = self._cache.get(url)
+            if entry and time.time() - entry['ts'] < PROBE_CACHE_TTL:
+                return entry['result']
+        
+        result = self._probe_endpoint(url, description)
+        
+        # Errors are usually transient, so only cache real responses
+        if self._cache is not None and result['status_code'] != 'error':
+            with self._cache_lock:
+                self._cache[url] = {'ts': time.time(), 'result': result}
+        return result
+    
+    def _probe_endpoint(self, url: str, description: str) -> Dict[str, Any]:
         """Test a specific endpoint with detailed analysis."""
+        if self._host_dead:
+            return self._unavailable_status(url, description, 'error',
+                                            error=f"Host unreachable after {CONNECT_FAILURE_LIMIT} connect timeouts")
         try:
-            response = self.session.get(url, timeout=10)
+            # Check existence with a body-less HEAD first; only endpoints that
+            # answer 200 (or do not support HEAD) are worth a GET for content
+            response = self.session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=True)
+            response.close()
+            body = b''
+            if response.status_code in GET_AFTER_HEAD_STATUSES:
+                # Only the start of the body is needed to fingerprint a service
+                response = self.session.get(url, stream=True, timeout=PROBE_TIMEOUT)
+                try:
+                    body = response.raw.read(PROBE_BODY_BYTES, decode_content=True) or b''
+                finally:
+                    _release(response)
+            text = body.decode('utf-8', 'replace')
+            self._connect_failures = 0
+            # Copy only the headers the report uses, not the whole header map
+            headers = {name: response.headers[name] for name in INTERESTING_HEADERS if name in response.headers}
+            content_length = headers.get('content-length')
+            response_size = int(content_length) if content_length and content_length.isdigit() else len(body)
             
             # Analyze response
-            content_type = response.headers.get('content-type', '').lower()
+            content_type = headers.get('content-type', '').lower()
             is_json = 'json' in content_type
             is_html = 'html' in content_type
             is_text = 'text' in content_type
             is_xml = 'xml' in content_type
             
             # Check for specific service indicators
-            response_text = response.text.lower() if response.text else ''
-            is_kafka_related = any(keyword in response_text for keyword in ['kafka', 'broker', 'topic', 'partition'])
-            is_connect_related = any(keyword in response_text for keyword in ['connect', 'connector', 'plugin'])
-            is_knox_related = any(keyword in response_text for keyword in ['knox', 'gateway', 'token', 'auth'])
-            is_admin_related = any(keyword in response_text for keyword in ['admin', 'management', 'api', 'service'])
-            is_cdp_related = any(keyword in response_text for keyword in ['cdp', 'cloudera', 'data platform'])
+            indicators = self._match_indicators(text)
+            is_kafka_related = 'kafka' in indicators
+            is_connect_related = 'connect' in indicators
+            is_knox_related = 'knox' in indicators
+            is_admin_related = 'admin' in indicators
+            is_cdp_related = 'cdp' in indicators
             
-            # Determine if this is a useful endpoint
+            # Determine if this is a useful endpoint; a protected endpoint
+            # (401/403) exists even though its body was not fetched
             is_useful = (
-                response.status_code in [200, 401, 403] and
-                (is_json or is_kafka_related or is_connect_related or is_knox_related or is_admin_related or is_cdp_related)
+                response.status_code in [401, 403] or
+                (response.status_code == 200 and
+                 (is_json or is_kafka_related or is_connect_related or is_knox_related or is_admin_related or is_cdp_related))
             )
             
             return {
@@ -207,33 +484,49 @@ class ComprehensiveCDPDiscovery:
                 'is_knox_related': is_knox_related,
                 'is_admin_related': is_admin_related,
                 'is_cdp_related': is_cdp_related,
-                'response_size': len(response.text),
-                'response_preview': response.text[:300] if response.text else '',
-                'headers': dict(response.headers),
-                'cookies': dict(response.cookies) if response.cookies else {}
+                'response_size': response_size,
+                'response_preview': text[:300],
+                'headers': headers,
+                'cookies': response.cookies.get_dict() if len(response.cookies) else {}
             }
+        except requests.exceptions.ConnectTimeout as e:
+            with self._cache_lock:
+                self._connect_failures += 1
+                if self._connect_failures >= CONNECT_FAILURE_LIMIT:
+                    self._host_dead = True
+            return self._unavailable_status(url, description, 'error', error=str(e))
         except Exception as e:
-            return {
-                'url': url,
-                'description': description,
-                'status_code': 'error',
-                'available': False,
-                'error': str(e),
-                'content_type': '',
-                'is_json': False,
-                'is_html': False,
-                'is_text': False,
-                'is_xml': False,
-                'is_kafka_related': False,
-                'is_connect_related': False,
-                'is_knox_related': False,
-                'is_admin_related': False,
-                'is_cdp_related': False,
-                'response_size': 0,
-                'response_preview': '',
-                'headers': {},
-                'cookies': {}
-            }
+            return self._unavailable_status(url, description, 'error', error=str(e))
+    
+    def _skipped_status(self, path: str, description: str, parent: str) -> Dict[str, Any]:
+        """Build the result recorded for a path pruned because its parent 404'd."""
+        return self._unavailable_status(urljoin(self.base_url, path), description, 'skipped',
+                                        skipped=True, skipped_because=f"{parent} returned 404")
+    
+    @staticmethod
+    def _unavailable_status(url: str, description: str, status_code: str, **extra) -> Dict[str, Any]:
+        """Build a result for an endpoint that produced no usable response."""
+        return {
+            'url': url,
+            'description': description,
+            'status_code': status_code,
+            'available': False,
+            **extra,
+            'content_type': '',
+            'is_json': False,
+            'is_html': False,
+            'is_text': False,
+            'is_xml': False,
+            'is_kafka_related': False,
+            'is_connect_related': False,
+            'is_knox_related': False,
+            'is_admin_related': False,
+            'is_cdp_related': False,
+            'response_size': 0,
+            'response_preview': '',
+            'headers': {},
+            'cookies': {}
+        }
     
     def analyze_discovered_services(self) -> Dict[str, Any]:
         """Analyze discovered services and categorize them."""
@@ -249,26 +542,24 @@ class ComprehensiveCDPDiscovery:
             'admin_services': [],
             'cdp_services': [],
             'other_services': [],
-            'error_services': []
+            'error_services': [],
+            'service_categories': {}
         }
         
         for path, service_info in self.discovered_services.items():
             if service_info['available']:
                 analysis['available_services'] += 1
                 
-                # Categorize services
-                if service_info.get('is_kafka_related') or 'kafka' in path.lower():
-                    analysis['kafka_services'].append((path, service_info))
-                elif service_info.get('is_connect_related') or 'connect' in path.lower():
-                    analysis['connect_services'].append((path, service_info))
-                elif service_info.get('is_knox_related') or 'knox' in path.lower() or 'gateway' in path.lower():
-                    analysis['knox_services'].append((path, service_info))
-                elif service_info.get('is_admin_related') or 'admin' in path.lower() or 'api' in path.lower():
-                    analysis['admin_services'].append((path, service_info))
-                elif service_info.get('is_cdp_related') or 'cdp' in path.lower():
-                    analysis['cdp_services'].append((path, service_info))
-                else:
-                    analysis['other_services'].append((path, service_info))
+                # Categorize services: every matching category is recorded,
+                # the first match in CATEGORY_RULES order picks the bucket
+                path_lc = path.lower()
+                categories = tuple(
+                    bucket for bucket, flag, tokens in CATEGORY_RULES
+                    if service_info.get(flag) or any(token in path_lc for token in tokens)
+                )
+                categories = categories or ('other_services',)
+                analysis['service_categories'][path] = categories
+                analysis[categories[0]].append((path, service_info))
             else:
                 if service_info.get('error'):
                     analysis['error_services'].append((path, service_info))
@@ -300,8 +591,9 @@ class ComprehensiveCDPDiscovery:
                     return (0 if status == 200 else 1 if status == 401 else 2 if status == 403 else 3, -item[1]['response_size'])
                 return (4, 0)
             
-            services.sort(key=sort_key)
-            return services[0][1]['url']
+            # Only the best entry is needed; min() avoids sorting (and
+            # mutating) the analysis lists
+            return min(services, key=sort_key)[1]['url']
         
         # Select best endpoints
         config['recommended_endpoints']['kafka_rest'] = select_best_endpoint(analysis['kafka_services'], 'kafka_rest')
@@ -398,6 +690,13 @@ class ComprehensiveCDPDiscovery:
 
 def main():
     """Main function to run comprehensive CDP discovery."""
+    parser = argparse.ArgumentParser(description="Comprehensive CDP service discovery")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"Ignore and do not update the probe cache ({PROBE_CACHE_FILE})")
+    parser.add_argument('--no-prune', action='store_true',
+                        help="Probe every path even when its parent prefix returned 404")
+    args = parser.parse_args()
+    
     # Configuration
     base_url = os.getenv("CDP_REST_BASE_URL", "https://your-cdp-cluster.example.com:443")
     username = os.getenv("CDP_REST_USERNAME", "your-username")
@@ -410,7 +709,8 @@ def main():
     print("=" * 60)
     
     # Initialize discovery
-    discovery = ComprehensiveCDPDiscovery(base_url, username, password)
+    discovery = ComprehensiveCDPDiscovery(base_url, username, password, use_cache=not args.no_cache,
+                                          prune_subpaths=not args.no_prune)
     
     # Discover all services
     discovered = discovery.discover_all_services()
@@ -426,18 +726,19 @@ def main():
     
     # Save results
     results_file = "comprehensive_cdp_discovery_results.json"
+    results = {
+        'discovered_services': discovered,
+        'analysis': analysis,
+        'configuration': config
+    }
     with open(results_file, 'w') as f:
-        json.dump({
-            'discovered_services': discovered,
-            'analysis': analysis,
-            'configuration': config
-        }, f, indent=2)
+        f.write(dumps(results))
     
     print(f"\n💾 Complete results saved to: {results_file}")
     
     # Print recommended configuration
     print(f"\n⚙️ Recommended Configuration:")
-    print(json.dumps(config['configuration_files']['kafka_config_cdp_rest.yaml'], indent=2))
+    print(dumps(config['configuration_files']['kafka_config_cdp_rest.yaml']))
 
 if __name__ == "__main__":
     main()
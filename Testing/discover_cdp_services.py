@@ -3,14 +3,175 @@
 CDP Service Discovery and Configuration Script
 """
 
+import base64
+import io
 import requests
 import json
 import time
 import sys
 import os
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+# Number of endpoint probes run concurrently; probes are network-bound
+PROBE_WORKERS = 16
+
+# Keep-alive connections per host pool, sized above PROBE_WORKERS so the
+# three concurrent discovery passes never discard pooled connections
+POOL_MAXSIZE = 32
+
+# Knox gateway context the service paths live under, and its admin API
+# listing the topologies actually deployed there
+GATEWAY_PATH = "/irb-kakfa-only"
+KNOX_TOPOLOGIES_PATH = f"{GATEWAY_PATH}/admin/api/v1/topologies"
+
+# Bytes of each probe response read; only a short preview is reported
+PREVIEW_BYTES = 200
+
+# Unread bytes drained from a probe response so its connection can be
+# reused; anything longer is closed instead
+DRAIN_BYTES = 64 * 1024
+
+# Service keywords looked for in a response preview, found in one scan
+INDICATOR_RE = re.compile(rb'kafka|connect|admin')
+
+# Seconds a probe result is reused for a URL tested by several discovery passes
+PROBE_CACHE_TTL = 60
+
+# Candidate service paths probed by discover_services
+SERVICE_PATHS: Tuple[str, ...] = (
+    # CDP Proxy API paths
+    "/irb-kakfa-only/cdp-proxy-api",
+    "/irb-kakfa-only/cdp-proxy",
+    "/irb-kakfa-only/cdp-proxy-token",
+
+    # Kafka service paths
+    "/irb-kakfa-only/kafka",
+    "/irb-kakfa-only/kafka-rest",
+    "/irb-kakfa-only/kafka-connect",
+    "/irb-kakfa-only/kafka-topics",
+
+    # Knox Gateway paths
+    "/irb-kakfa-only/knox",
+    "/irb-kakfa-only/gateway",
+    "/irb-kakfa-only/knox-gateway",
+
+    # SMM paths
+    "/irb-kakfa-only/smm",
+    "/irb-kakfa-only/smm-api",
+    "/irb-kakfa-only/streams-messaging-manager",
+
+    # Admin paths
+    "/irb-kakfa-only/admin",
+    "/irb-kakfa-only/api",
+    "/irb-kakfa-only/management",
+
+    # Health and info paths
+    "/irb-kakfa-only/health",
+    "/irb-kakfa-only/info",
+    "/irb-kakfa-only/status",
+
+    # Root paths
+    "/",
+    "/api",
+    "/health",
+    "/info",
+    "/status"
+)
+
+# Kafka REST API path candidates
+KAFKA_REST_PATTERNS: Tuple[str, ...] = (
+    "/irb-kakfa-only/cdp-proxy-api/kafka-rest",
+    "/irb-kakfa-only/cdp-proxy/kafka-rest",
+    "/irb-kakfa-only/kafka-rest",
+    "/irb-kakfa-only/kafka/rest",
+    "/irb-kakfa-only/rest",
+    "/kafka-rest",
+    "/rest"
+)
+
+# Kafka Connect path candidates
+KAFKA_CONNECT_PATTERNS: Tuple[str, ...] = (
+    "/irb-kakfa-only/cdp-proxy-api/kafka-connect",
+    "/irb-kakfa-only/cdp-proxy/kafka-connect",
+    "/irb-kakfa-only/kafka-connect",
+    "/irb-kakfa-only/kafka/connect",
+    "/kafka-connect",
+    "/connect"
+)
+
+# Knox Gateway path candidates
+KNOX_PATTERNS: Tuple[str, ...] = (
+    "/irb-kakfa-only/cdp-proxy-token",
+    "/irb-kakfa-only/knox-gateway",
+    "/irb-kakfa-only/knox",
+    "/irb-kakfa-only/gateway",
+    "/knox-gateway",
+    "/knox",
+    "/gateway"
+)
+
+# Admin/Management API path candidates
+ADMIN_PATTERNS: Tuple[str, ...] = (
+    "/irb-kakfa-only/cdp-proxy-api",
+    "/irb-kakfa-only/admin",
+    "/irb-kakfa-only/api",
+    "/irb-kakfa-only/management",
+    "/admin",
+    "/api",
+    "/management"
+)
+
+
+@lru_cache(maxsize=8)
+def _basic_auth(username: str, password: str) -> str:
+    """Build (once per credential pair) the HTTP Basic Authorization header value."""
+    return 'Basic ' + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+def _release(response: requests.Response) -> None:
+    """Finish with a streamed response so its keep-alive connection is reused.
+    
+    The unread rest of the body is drained when it is at most DRAIN_BYTES,
+    which hands the connection back to the pool; a longer (or broken) body
+    costs more to read than a new connection, so the connection is closed.
+    """
+    raw = response.raw
+    try:
+        remaining = getattr(raw, 'length_remaining', None)
+        drained = 0
+        while (remaining is None or remaining <= DRAIN_BYTES) and drained <= DRAIN_BYTES:
+            chunk = raw.read(16384, decode_content=True)
+            if not chunk:
+                raw.release_conn()
+                return
+            drained += len(chunk)
+    except Exception:
+        pass
+    response.close()
+
+
 class CDPServiceDiscovery:
     """Discover and configure CDP services."""
     
@@ -21,22 +182,37 @@ class CDPServiceDiscovery:
         self.session = requests.Session()
         self.discovered_services = {}
         
+        # Full URL of every known candidate path, joined once per instance
+        self._probe_urls: Dict[str, str] = {"": self.base_url}
+        for path in SERVICE_PATHS + KAFKA_REST_PATTERNS + KAFKA_CONNECT_PATTERNS + KNOX_PATTERNS + ADMIN_PATTERNS:
+            self._probe_urls.setdefault(path, urljoin(self.base_url, path))
+        
+        # Deployed Knox topology names; None until loaded, empty set if unknown
+        self._topologies: Optional[set] = None
+        self._topologies_lock = threading.Lock()
+        
+        # Probe results keyed by URL, as (monotonic time, result)
+        self._probe_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._probe_cache_lock = threading.Lock()
+        
         # Setup authentication
         self._setup_auth()
     
     def _setup_auth(self):
         """Setup authentication for CDP services."""
-        import base64
-        credentials = f"{self.username}:{self.password}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        
         self.session.headers.update({
-            'Authorization': f'Basic {encoded_credentials}',
+            'Authorization': _basic_auth(self.username, self.password),
             'Accept': 'application/json',
             'Content-Type': 'application/json',
             'User-Agent': 'CDF-Kafka-MCP-Server/1.0'
         })
         
+        # Reuse TLS connections across probes instead of handshaking per request
+        adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE,
+                              max_retries=Retry(total=1, backoff_factor=0.1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Disable SSL warnings
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -47,64 +223,89 @@ class CDPServiceDiscovery:
         print("🔍 Discovering CDP Services...")
         print("=" * 60)
         
-        # Test base connectivity
-        base_status = self._test_endpoint(self.base_url, "Base URL")
-        
-        # Discover various service paths
-        service_paths = [
-            # CDP Proxy API paths
-            "/irb-kakfa-only/cdp-proxy-api",
-            "/irb-kakfa-only/cdp-proxy",
-            "/irb-kakfa-only/cdp-proxy-token",
-            
-            # Kafka service paths
-            "/irb-kakfa-only/kafka",
-            "/irb-kakfa-only/kafka-rest",
-            "/irb-kakfa-only/kafka-connect",
-            "/irb-kakfa-only/kafka-topics",
-            
-            # Knox Gateway paths
-            "/irb-kakfa-only/knox",
-            "/irb-kakfa-only/gateway",
-            "/irb-kakfa-only/knox-gateway",
-            
-            # SMM paths
-            "/irb-kakfa-only/smm",
-            "/irb-kakfa-only/smm-api",
-            "/irb-kakfa-only/streams-messaging-manager",
-            
-            # Admin paths
-            "/irb-kakfa-only/admin",
-            "/irb-kakfa-only/api",
-            "/irb-kakfa-only/management",
-            
-            # Health and info paths
-            "/irb-kakfa-only/health",
-            "/irb-kakfa-only/info",
-            "/irb-kakfa-only/status",
-            
-            # Root paths
-            "/",
-            "/api",
-            "/health",
-            "/info",
-            "/status"
-        ]
+        # Probe the base URL alongside the service paths
+        results = self._probe_paths([("", "Base URL")] + [(path, path) for path in SERVICE_PATHS])
         
         discovered = {}
-        for path in service_paths:
-            full_url = urljoin(self.base_url, path)
-            status = self._test_endpoint(full_url, path)
+        for path, status in results[1:]:
             if status['available']:
                 discovered[path] = status
         
         self.discovered_services = discovered
         return discovered
     
+    def _load_knox_topologies(self) -> set:
+        """Fetch the deployed topology names from the Knox admin API.
+        
+        Returns an empty set when the admin API is unreachable or unparsable,
+        in which case no path is filtered.
+        """
+        with self._topologies_lock:
+            if self._topologies is None:
+                self._topologies = set()
+                try:
+                    response = self.session.get(urljoin(self.base_url, KNOX_TOPOLOGIES_PATH),
+                                                headers={'Accept': 'application/xml'}, timeout=10)
+                    if response.status_code == 200:
+                        root = ET.fromstring(response.text)
+                        self._topologies = {name for name in
+                                            (topology.findtext('name') for topology in root.iter('topology'))
+                                            if name}
+                except (requests.RequestException, ET.ParseError):
+                    pass
+                if self._topologies:
+                    print(f"🗺️  Knox topologies: {', '.join(sorted(self._topologies))}")
+            return self._topologies
+    
+    def _is_deployed(self, path: str, topologies: set) -> bool:
+        """Check whether a gateway path belongs to a deployed Knox topology."""
+        if not topologies or not path.startswith(GATEWAY_PATH + "/"):
+            return True
+        return path[len(GATEWAY_PATH) + 1:].split('/', 1)[0] in topologies
+    
+    def _probe_paths(self, paths: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Probe (path, name) pairs concurrently, returning (path, status) in input order.
+        
+        Gateway paths under a topology Knox does not advertise are not probed.
+        """
+        topologies = self._load_knox_topologies()
+        paths = [(path, name) for path, name in paths if self._is_deployed(path, topologies)]
+        
+        def probe(item):
+            path, name = item
+            url = self._probe_urls.get(path) or urljoin(self.base_url, path)
+            return path, self._test_endpoint(url, name)
+        
+        with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+            return list(executor.map(probe, paths))
+    
     def _test_endpoint(self, url: str, name: str) -> Dict[str, Any]:
+        """Test a specific endpoint, reusing a recent result for the same URL."""
+        with self._probe_cache_lock:
+            cached = self._probe_cache.get(url)
+        if cached and time.monotonic() - cached[0] < PROBE_CACHE_TTL:
+            return {**cached[1], 'name': name}
+        
+        result = self._probe_endpoint(url, name)
+        with self._probe_cache_lock:
+            self._probe_cache[url] = (time.monotonic(), result)
+        return result
+    
+    def _probe_endpoint(self, url: str, name: str) -> Dict[str, Any]:
         """Test a specific endpoint."""
         try:
-            response = self.session.get(url, timeout=10)
+            # Stream the response and read only the preview instead of
+            # downloading whole landing pages (Knox, SMM UI)
+            response = self.session.get(url, timeout=10, stream=True)
+            try:
+                preview_bytes = response.raw.read(PREVIEW_BYTES, decode_content=True) or b''
+            finally:
+                _release(response)
+            preview = preview_bytes.decode('utf-8', 'replace')
+            hits = set(INDICATOR_RE.findall(preview_bytes.lower()))
+            url_lc = url.lower()
+            content_length = response.headers.get('content-length')
+            response_size = int(content_length) if content_length and content_length.isdigit() else len(preview_bytes)
             
             # Determine if this is a useful endpoint
             content_type = response.headers.get('content-type', '').lower()
@@ -113,9 +314,9 @@ class CDPServiceDiscovery:
             is_text = 'text' in content_type
             
             # Check for specific indicators
-            is_kafka_rest = 'kafka' in url.lower() and (response.status_code == 200 or 'kafka' in response.text.lower())
-            is_connect_api = 'connect' in url.lower() and (response.status_code == 200 or 'connect' in response.text.lower())
-            is_admin_api = 'admin' in url.lower() and (response.status_code == 200 or 'admin' in response.text.lower())
+            is_kafka_rest = 'kafka' in url_lc and (response.status_code == 200 or b'kafka' in hits)
+            is_connect_api = 'connect' in url_lc and (response.status_code == 200 or b'connect' in hits)
+            is_admin_api = 'admin' in url_lc and (response.status_code == 200 or b'admin' in hits)
             
             return {
                 'url': url,
@@ -129,8 +330,8 @@ class CDPServiceDiscovery:
                 'is_kafka_rest': is_kafka_rest,
                 'is_connect_api': is_connect_api,
                 'is_admin_api': is_admin_api,
-                'response_size': len(response.text),
-                'response_preview': response.text[:200] if response.text else '',
+                'response_size': response_size,
+                'response_preview': preview,
                 'headers': dict(response.headers)
             }
         except Exception as e:
@@ -159,36 +360,11 @@ class CDPServiceDiscovery:
         
         kafka_services = {}
         
-        # Test common Kafka REST API patterns
-        kafka_patterns = [
-            "/irb-kakfa-only/cdp-proxy-api/kafka-rest",
-            "/irb-kakfa-only/cdp-proxy/kafka-rest",
-            "/irb-kakfa-only/kafka-rest",
-            "/irb-kakfa-only/kafka/rest",
-            "/irb-kakfa-only/rest",
-            "/kafka-rest",
-            "/rest"
-        ]
-        
-        for pattern in kafka_patterns:
-            full_url = urljoin(self.base_url, pattern)
-            status = self._test_endpoint(full_url, f"Kafka REST: {pattern}")
+        for pattern, status in self._probe_paths([(p, f"Kafka REST: {p}") for p in KAFKA_REST_PATTERNS]):
             if status['available']:
                 kafka_services[f"kafka_rest_{pattern.replace('/', '_')}"] = status
         
-        # Test Kafka Connect patterns
-        connect_patterns = [
-            "/irb-kakfa-only/cdp-proxy-api/kafka-connect",
-            "/irb-kakfa-only/cdp-proxy/kafka-connect",
-            "/irb-kakfa-only/kafka-connect",
-            "/irb-kakfa-only/kafka/connect",
-            "/kafka-connect",
-            "/connect"
-        ]
-        
-        for pattern in connect_patterns:
-            full_url = urljoin(self.base_url, pattern)
-            status = self._test_endpoint(full_url, f"Kafka Connect: {pattern}")
+        for pattern, status in self._probe_paths([(p, f"Kafka Connect: {p}") for p in KAFKA_CONNECT_PATTERNS]):
             if status['available']:
                 kafka_services[f"kafka_connect_{pattern.replace('/', '_')}"] = status
         
@@ -201,20 +377,7 @@ class CDPServiceDiscovery:
         
         knox_services = {}
         
-        # Test Knox Gateway patterns
-        knox_patterns = [
-            "/irb-kakfa-only/cdp-proxy-token",
-            "/irb-kakfa-only/knox-gateway",
-            "/irb-kakfa-only/knox",
-            "/irb-kakfa-only/gateway",
-            "/knox-gateway",
-            "/knox",
-            "/gateway"
-        ]
-        
-        for pattern in knox_patterns:
-            full_url = urljoin(self.base_url, pattern)
-            status = self._test_endpoint(full_url, f"Knox: {pattern}")
+        for pattern, status in self._probe_paths([(p, f"Knox: {p}") for p in KNOX_PATTERNS]):
             if status['available']:
                 knox_services[f"knox_{pattern.replace('/', '_')}"] = status
         
@@ -227,20 +390,7 @@ class CDPServiceDiscovery:
         
         admin_services = {}
         
-        # Test Admin API patterns
-        admin_patterns = [
-            "/irb-kakfa-only/cdp-proxy-api",
-            "/irb-kakfa-only/admin",
-            "/irb-kakfa-only/api",
-            "/irb-kakfa-only/management",
-            "/admin",
-            "/api",
-            "/management"
-        ]
-        
-        for pattern in admin_patterns:
-            full_url = urljoin(self.base_url, pattern)
-            status = self._test_endpoint(full_url, f"Admin: {pattern}")
+        for pattern, status in self._probe_paths([(p, f"Admin: {p}") for p in ADMIN_PATTERNS]):
             if status['available']:
                 admin_services[f"admin_{pattern.replace('/', '_')}"] = status
         
@@ -260,38 +410,28 @@ class CDPServiceDiscovery:
             'configuration_template': {}
         }
         
-        # Find best endpoints for each service type
-        kafka_rest_candidates = []
-        kafka_connect_candidates = []
-        knox_candidates = []
-        admin_candidates = []
-        
+        # Pick the best endpoint per service type in a single pass; ties keep
+        # the first candidate, as max() did
+        best: Dict[str, Tuple[int, str]] = {}
         for service_name, service_info in self.discovered_services.items():
             if service_info.get('is_kafka_rest') or 'kafka-rest' in service_name:
-                kafka_rest_candidates.append((service_name, service_info))
+                category = 'kafka_rest'
             elif service_info.get('is_connect_api') or 'connect' in service_name:
-                kafka_connect_candidates.append((service_name, service_info))
+                category = 'kafka_connect'
             elif 'knox' in service_name or 'gateway' in service_name:
-                knox_candidates.append((service_name, service_info))
+                category = 'knox_gateway'
             elif 'admin' in service_name or 'api' in service_name:
-                admin_candidates.append((service_name, service_info))
-        
-        # Select best candidates
-        if kafka_rest_candidates:
-            best_kafka_rest = max(kafka_rest_candidates, key=lambda x: x[1]['status_code'] if isinstance(x[1]['status_code'], int) else 0)
-            config['recommended_endpoints']['kafka_rest'] = best_kafka_rest[1]['url']
-        
-        if kafka_connect_candidates:
-            best_kafka_connect = max(kafka_connect_candidates, key=lambda x: x[1]['status_code'] if isinstance(x[1]['status_code'], int) else 0)
-            config['recommended_endpoints']['kafka_connect'] = best_kafka_connect[1]['url']
-        
-        if knox_candidates:
-            best_knox = max(knox_candidates, key=lambda x: x[1]['status_code'] if isinstance(x[1]['status_code'], int) else 0)
-            config['recommended_endpoints']['knox_gateway'] = best_knox[1]['url']
+                category = 'admin_api'
+            else:
+                continue
+            
+            status_code = service_info['status_code']
+            score = status_code if isinstance(status_code, int) else 0
+            if category not in best or score > best[category][0]:
+                best[category] = (score, service_info['url'])
         
-        if admin_candidates:
-            best_admin = max(admin_candidates, key=lambda x: x[1]['status_code'] if isinstance(x[1]['status_code'], int) else 0)
-            config['recommended_endpoints']['admin_api'] = best_admin[1]['url']
+        for category, (_, url) in best.items():
+            config['recommended_endpoints'][category] = url
         
         # Generate configuration template
         config['configuration_template'] = {
@@ -320,43 +460,49 @@ class CDPServiceDiscovery:
     
     def print_discovery_report(self):
         """Print comprehensive discovery report."""
-        print("\n" + "=" * 80)
-        print("📊 CDP SERVICE DISCOVERY REPORT")
-        print("=" * 80)
+        # Build the report in memory and write it to stdout in one call
+        out = io.StringIO()
+        emit = partial(print, file=out)
+        
+        emit("\n" + "=" * 80)
+        emit("📊 CDP SERVICE DISCOVERY REPORT")
+        emit("=" * 80)
         
         # Summary
         total_services = len(self.discovered_services)
         available_services = sum(1 for s in self.discovered_services.values() if s['available'])
         
-        print(f"Total Services Tested: {total_services}")
-        print(f"Available Services: {available_services}")
-        print(f"Success Rate: {(available_services/total_services*100):.1f}%")
+        emit(f"Total Services Tested: {total_services}")
+        emit(f"Available Services: {available_services}")
+        emit(f"Success Rate: {(available_services/total_services*100):.1f}%")
         
         # Available services
-        print(f"\n✅ Available Services ({available_services}):")
+        emit(f"\n✅ Available Services ({available_services}):")
         for service_name, service_info in self.discovered_services.items():
             if service_info['available']:
                 status = service_info['status_code']
                 content_type = service_info['content_type']
-                print(f"  {service_name}: {status} ({content_type})")
+                emit(f"  {service_name}: {status} ({content_type})")
         
         # Unavailable services
-        print(f"\n❌ Unavailable Services ({total_services - available_services}):")
+        emit(f"\n❌ Unavailable Services ({total_services - available_services}):")
         for service_name, service_info in self.discovered_services.items():
             if not service_info['available']:
                 error = service_info.get('error', f"Status {service_info['status_code']}")
-                print(f"  {service_name}: {error}")
+                emit(f"  {service_name}: {error}")
         
         # Recommendations
-        print(f"\n🔧 Recommendations:")
+        emit(f"\n🔧 Recommendations:")
         if available_services == 0:
-            print("  - Check base URL and authentication credentials")
-            print("  - Verify CDP services are running")
-            print("  - Check network connectivity")
+            emit("  - Check base URL and authentication credentials")
+            emit("  - Verify CDP services are running")
+            emit("  - Check network connectivity")
         else:
-            print("  - Use discovered working endpoints")
-            print("  - Configure MCP server with recommended endpoints")
-            print("  - Test each service individually")
+            emit("  - Use discovered working endpoints")
+            emit("  - Configure MCP server with recommended endpoints")
+            emit("  - Test each service individually")
+        
+        sys.stdout.write(out.getvalue())
 
 def main():
     """Main function to run CDP service discovery."""
@@ -377,10 +523,14 @@ def main():
     # Discover services
     discovered = discovery.discover_services()
     
-    # Discover specific service types
-    kafka_services = discovery.discover_kafka_services()
-    knox_services = discovery.discover_knox_services()
-    admin_services = discovery.discover_admin_services()
+    # Discover specific service types concurrently; they share no state
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        kafka_future = executor.submit(discovery.discover_kafka_services)
+        knox_future = executor.submit(discovery.discover_knox_services)
+        admin_future = executor.submit(discovery.discover_admin_services)
+        kafka_services = kafka_future.result()
+        knox_services = knox_future.result()
+        admin_services = admin_future.result()
     
     # Generate configuration
     config = discovery.generate_configuration()
@@ -391,13 +541,13 @@ def main():
     # Save configuration
     config_file = "cdp_discovered_config.json"
     with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
+        f.write(dumps(config))
     
     print(f"\n💾 Configuration saved to: {config_file}")
     
     # Print recommended configuration
     print(f"\n⚙️ Recommended Configuration:")
-    print(json.dumps(config['configuration_template'], indent=2))
+    print(dumps(config['configuration_template']))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Run the CDP Testing scripts in one process and one event loop
+
+The scripts share a single MCP server and CDP Kafka client built from the
+same configuration, so authentication and endpoint discovery happen once
+instead of once per script.
+
+Usage:
+    python run_all.py [config_path]
+"""
+
+import asyncio
+import sys
+
+from _common import get_client, get_logger, mcp_session, run
+from add_value_to_mcptesttopic import add_value_to_topic
+from test_cdp_rest_integration import CDPRestIntegrationTester
+
+DEFAULT_CONFIG_PATH = '../config/kafka_config.yaml'
+
+log = get_logger(__name__)
+
+
+async def run_all(config_path: str) -> bool:
+    """Run all scripts concurrently against shared clients.
+    
+    Returns:
+        True if every script finished without raising and reported success
+    """
+    client = get_client(config_path)
+    scripts = ('add_value_to_mcptesttopic', 'test_cdp_rest_integration')
+    
+    async with mcp_session(config_path) as server:
+        results = await asyncio.gather(
+            add_value_to_topic(client),
+            CDPRestIntegrationTester(config_path, server=server).run_all_tests(),
+            return_exceptions=True
+        )
+    
+    ok = True
+    for script, result in zip(scripts, results):
+        if isinstance(result, BaseException):
+            log.error(f"{script} failed: {result!r}", exc_info=result)
+            ok = False
+        elif isinstance(result, dict):
+            # An empty result means the MCP server never initialized
+            failed = [name for name, passed in result.items() if not passed] if result else ['initialize_server']
+            if failed:
+                log.error(f"{script} failed: {', '.join(failed)}")
+                ok = False
+        elif not result:
+            log.error(f"{script} failed")
+            ok = False
+    return ok
+
+
+def main() -> int:
+    """Main entry point."""
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    return 0 if run(run_all(config_path)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,153 +4,336 @@ Main Test Runner for CDF Kafka MCP Server Testing Suite
 Runs all test suites and provides comprehensive reporting
 """
 
+import argparse
 import asyncio
+import io
 import json
 import os
+import socket
 import sys
 import time
-from typing import Dict, List, Any
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit
 
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Output buffer of the suite running in the current task (or its worker threads)
+_suite_output: ContextVar[Optional[io.StringIO]] = ContextVar('suite_output', default=None)
+
+
+# Status label printed for each test result (True, False or None for skipped)
+RESULT_STATUS = {True: "✅ PASS", False: "❌ FAIL", None: "⏭️  SKIP"}
+
+
+# Upper bound, in seconds, for any single test step
+SUITE_TIMEOUT = int(os.getenv("SUITE_TIMEOUT_S", "300"))
+
+
+async def _bounded(coro, results: Dict[str, Any], name: str, keys: Tuple[str, ...] = (),
+                   timeout: float = SUITE_TIMEOUT):
+    """Await a test step, bounded by timeout.
+    
+    keys are the results the step records; if it times out, any of them it
+    has not recorded yet are marked failed. Steps with no keys (setup) only
+    return False.
+    """
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        print(f"⏱️  {name} timed out after {timeout}s")
+        for key in keys:
+            results.setdefault(key, False)
+        return False
+
+
+# Result keys each MCPToolsTester test method records
+MCP_RESULT_KEYS = {
+    "test_tool_registration": ("tool_registration",),
+    "test_list_topics_tool": ("list_topics",),
+    "test_create_topic_tool": ("create_topic",),
+    "test_produce_message_tool": ("produce_message",),
+    "test_consume_messages_tool": ("consume_messages",),
+    "test_kafka_connect_tools": ("connect_list_connectors", "connect_list_connector_plugins",
+                                 "connect_get_connect_server_info"),
+    "test_knox_tools": ("knox_get_knox_token", "knox_validate_knox_token"),
+}
+
+
+# MCPToolsTester methods grouped into stages. Stages run in order; the tests
+# within a stage are independent and run concurrently. The create -> produce ->
+# consume chain shares the test topic, so each of those is a stage of its own.
+MCP_TEST_PLAN = (
+    ("test_tool_registration", "test_list_topics_tool", "test_kafka_connect_tools", "test_knox_tools"),
+    ("test_create_topic_tool",),
+    ("test_produce_message_tool",),
+    ("test_consume_messages_tool",),
+)
+
+
+def _pct(num: int, den: int) -> float:
+    """num as a percentage of den, or 0.0 when den is zero."""
+    return 0.0 if not den else num * 100.0 / den
+
+
+def _probe(host: str, port: int, timeout: float = 1.0) -> bool:
+    """Return True if a TCP connection to host:port can be opened within timeout."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _knox_gateway_address() -> Optional[tuple]:
+    """(host, port) of the Knox gateway from KNOX_GATEWAY, or None when it is not set."""
+    gateway = os.getenv("KNOX_GATEWAY")
+    if not gateway:
+        return None
+    parts = urlsplit(gateway if "://" in gateway else f"https://{gateway}")
+    return parts.hostname, parts.port or (80 if parts.scheme == "http" else 443)
+
+
+class _SuiteStdout:
+    """stdout proxy that sends writes to the current suite's buffer, if any."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        buffer = _suite_output.get()
+        return (buffer if buffer is not None else self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
 
-# Import test modules
-from test_mcp_tools import MCPToolsTester
-from test_docker_deployment import DockerDeploymentTester
-from test_knox_integration import KnoxIntegrationTester
 
 class ComprehensiveTester:
-    def __init__(self):
+    def __init__(self, results_log: str = "test_results.jsonl"):
         self.all_results = {}
         self.start_time = None
         self.end_time = None
+        # Seconds each suite took, keyed like all_results
+        self.suite_timings: Dict[str, float] = {}
+        # Each suite's results are appended here as soon as it finishes; the
+        # file is started afresh on every run
+        self.results_log = results_log
+        self._jsonl = None
         
-    async def run_all_tests(self):
-        """Run all test suites"""
-        print("🚀 Starting Comprehensive CDF Kafka MCP Server Testing")
-        print("="*60)
+    async def run_all_tests(self, only: Optional[List[str]] = None):
+        """Run all test suites (or just those named in only) concurrently"""
+        print(f"🚀 Starting Comprehensive CDF Kafka MCP Server Testing\n{self._RULE}")
         
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         
-        # Test Suite 1: MCP Tools Testing
-        print("\n" + "="*60)
-        print("🧪 TEST SUITE 1: MCP TOOLS TESTING")
-        print("="*60)
+        # The suites are mostly waiting on the network, so run them together.
+        # Each suite prints into its own buffer (tracked per task through a
+        # context variable) and the buffers are written out in suite order.
+        suites = [getattr(self, self.SUITES[name]) for name in (only or self.SUITES)]
+        real_stdout = sys.stdout
+        sys.stdout = _SuiteStdout(real_stdout)
+        self._jsonl = open(self.results_log, 'wb')
+        try:
+            outcomes = await asyncio.gather(*(self._buffered(suite) for suite in suites))
+        finally:
+            sys.stdout = real_stdout
+            self._jsonl.close()
+            self._jsonl = None
+        
+        for suite, (output, outcome) in zip(suites, outcomes):
+            sys.stdout.write(output)
+            if isinstance(outcome, Exception):
+                print(f"\n❌ {suite.__name__.lstrip('_')} suite crashed: {outcome}")
+                continue
+            name, results = outcome
+            # A suite whose setup failed still gets an (empty) entry in the report
+            self.all_results[name] = results if results is not None else {}
+        
+        self.end_time = time.perf_counter()
+    
+    _RULE = "=" * 60
+    
+    @classmethod
+    def _banner(cls, idx: int, title: str) -> str:
+        """Heading printed at the start of a test suite."""
+        return f"\n{cls._RULE}\n🧪 TEST SUITE {idx}: {title}\n{cls._RULE}\n"
+    
+    async def _buffered(self, suite):
+        """Run a suite coroutine, returning what it printed and its result or exception."""
+        buffer = io.StringIO()
+        _suite_output.set(buffer)
+        started = time.perf_counter()
+        try:
+            outcome = await suite()
+        except Exception as e:
+            outcome = e
+            self.suite_timings[suite.__name__.lstrip('_')] = time.perf_counter() - started
+        else:
+            name, results = outcome
+            self.suite_timings[name] = time.perf_counter() - started
+            if results is not None:
+                self._append_suite(name, results)
+        return buffer.getvalue(), outcome
+    
+    def _append_suite(self, name: str, results: Dict[str, Any]):
+        """Append one suite's results as a JSON line, flushed to disk so a crash keeps it."""
+        record = {"suite": name, "ts": time.time(), "duration": self.suite_timings.get(name), "results": results}
+        line = orjson.dumps(record) if orjson is not None else json.dumps(record).encode()
+        self._jsonl.write(line + b"\n")
+        self._jsonl.flush()
+        os.fsync(self._jsonl.fileno())
+    
+    async def _run_mcp(self):
+        """Test Suite 1: MCP Tools Testing"""
+        sys.stdout.write(self._banner(1, "MCP TOOLS TESTING"))
+        
+        from test_mcp_tools import MCPToolsTester
         
         mcp_tester = MCPToolsTester()
-        if await mcp_tester.setup():
-            await mcp_tester.test_tool_registration()
-            await mcp_tester.test_list_topics_tool()
-            await mcp_tester.test_create_topic_tool()
-            await mcp_tester.test_produce_message_tool()
-            await mcp_tester.test_consume_messages_tool()
-            await mcp_tester.test_kafka_connect_tools()
-            await mcp_tester.test_knox_tools()
-            await mcp_tester.cleanup()
-            mcp_tester.print_summary()
-            self.all_results["mcp_tools"] = mcp_tester.test_results
-        
-        # Test Suite 2: Docker Deployment Testing
-        print("\n" + "="*60)
-        print("🧪 TEST SUITE 2: DOCKER DEPLOYMENT TESTING")
-        print("="*60)
+        if not await _bounded(mcp_tester.setup(), mcp_tester.test_results, "setup"):
+            return "mcp_tools", None
+        for stage in MCP_TEST_PLAN:
+            await asyncio.gather(*(
+                _bounded(getattr(mcp_tester, test)(), mcp_tester.test_results, test, MCP_RESULT_KEYS[test])
+                for test in stage
+            ))
+        await mcp_tester.cleanup()
+        mcp_tester.print_summary()
+        return "mcp_tools", mcp_tester.test_results
+    
+    async def _run_docker(self):
+        """Test Suite 2: Docker Deployment Testing"""
+        sys.stdout.write(self._banner(2, "DOCKER DEPLOYMENT TESTING"))
         
+        # Without a local broker every check would just wait out its timeout
+        if not await asyncio.to_thread(_probe, "localhost", 9092):
+            print("⏭️  Kafka is not listening on localhost:9092; skipping Docker deployment tests")
+            return "docker_deployment", {"preflight": None}
+        
+        from test_docker_deployment import DockerDeploymentTester
+        
+        # The Docker checks are blocking, so keep them off the event loop
         docker_tester = DockerDeploymentTester()
-        docker_tester.test_docker_compose_services()
-        docker_tester.test_kafka_connectivity()
-        docker_tester.test_kafka_connect_api()
-        docker_tester.test_smm_ui_accessibility()
-        await docker_tester.test_mcp_server_integration()
-        docker_tester.test_health_checks()
+        await _bounded(asyncio.to_thread(docker_tester.test_docker_compose_services), docker_tester.test_results, "docker_compose_services", ("docker_compose_services",))
+        await _bounded(asyncio.to_thread(docker_tester.test_kafka_connectivity), docker_tester.test_results, "kafka_connectivity", ("kafka_connectivity",))
+        await _bounded(asyncio.to_thread(docker_tester.test_kafka_connect_api), docker_tester.test_results, "kafka_connect_api", ("kafka_connect_api",))
+        await _bounded(asyncio.to_thread(docker_tester.test_smm_ui_accessibility), docker_tester.test_results, "smm_ui_accessibility", ("smm_ui",))
+        await _bounded(docker_tester.test_mcp_server_integration(), docker_tester.test_results, "mcp_server_integration", ("mcp_server_integration",))
+        await _bounded(asyncio.to_thread(docker_tester.test_health_checks), docker_tester.test_results, "health_checks", ("health_checks",))
         docker_tester.print_summary()
-        self.all_results["docker_deployment"] = docker_tester.test_results
+        return "docker_deployment", docker_tester.test_results
+    
+    async def _run_knox(self):
+        """Test Suite 3: Knox Integration Testing"""
+        sys.stdout.write(self._banner(3, "KNOX INTEGRATION TESTING"))
         
-        # Test Suite 3: Knox Integration Testing
-        print("\n" + "="*60)
-        print("🧪 TEST SUITE 3: KNOX INTEGRATION TESTING")
-        print("="*60)
+        gateway = _knox_gateway_address()
+        if gateway and not await asyncio.to_thread(_probe, *gateway):
+            print(f"⏭️  Knox gateway {gateway[0]}:{gateway[1]} is unreachable; skipping Knox integration tests")
+            return "knox_integration", {"preflight": None}
         
-        knox_tester = KnoxIntegrationTester()
-        if await knox_tester.setup():
-            await knox_tester.test_knox_token_retrieval()
-            await knox_tester.test_knox_token_validation()
-            await knox_tester.test_knox_token_refresh()
-            await knox_tester.test_knox_gateway_connectivity()
-            await knox_tester.test_knox_authentication_flow()
-            knox_tester.print_summary()
-            self.all_results["knox_integration"] = knox_tester.test_results
+        from test_knox_integration import KnoxIntegrationTester
         
-        self.end_time = time.time()
+        knox_tester = KnoxIntegrationTester()
+        if not await _bounded(knox_tester.setup(), knox_tester.test_results, "setup"):
+            return "knox_integration", None
+        await _bounded(knox_tester.test_knox_token_retrieval(), knox_tester.test_results, "knox_token_retrieval", ("knox_token_retrieval",))
+        await _bounded(knox_tester.test_knox_token_validation(), knox_tester.test_results, "knox_token_validation", ("knox_token_validation",))
+        await _bounded(knox_tester.test_knox_token_refresh(), knox_tester.test_results, "knox_token_refresh", ("knox_token_refresh",))
+        await _bounded(knox_tester.test_knox_gateway_connectivity(), knox_tester.test_results, "knox_gateway_connectivity", ("knox_gateway_connectivity",))
+        await _bounded(knox_tester.test_knox_authentication_flow(), knox_tester.test_results, "knox_authentication_flow", ("knox_authentication_flow",))
+        knox_tester.print_summary()
+        return "knox_integration", knox_tester.test_results
+    
+    # Suite name (as accepted by --only) -> coroutine method name. The test modules
+    # are imported inside each method so only the selected suites are loaded.
+    SUITES = {"mcp": "_run_mcp", "docker": "_run_docker", "knox": "_run_knox"}
     
     def print_comprehensive_summary(self):
         """Print comprehensive test results summary"""
-        print("\n" + "="*80)
-        print("📊 COMPREHENSIVE TEST RESULTS SUMMARY")
-        print("="*80)
+        # Assemble the whole report and write it once rather than line by line
+        out = ["\n" + "="*80, "📊 COMPREHENSIVE TEST RESULTS SUMMARY", "="*80]
+        ap = out.append
         
         total_tests = 0
-        total_passed = 0
-        total_failed = 0
-        total_skipped = 0
+        overall = Counter()
         
         for suite_name, suite_results in self.all_results.items():
+            # One pass per suite; results are True (pass), False (fail) or None (skip)
+            counts = Counter(suite_results.values())
             suite_total = len(suite_results)
-            suite_passed = sum(1 for result in suite_results.values() if result is True)
-            suite_failed = sum(1 for result in suite_results.values() if result is False)
-            suite_skipped = sum(1 for result in suite_results.values() if result is None)
+            suite_passed, suite_failed, suite_skipped = counts[True], counts[False], counts[None]
             
             total_tests += suite_total
-            total_passed += suite_passed
-            total_failed += suite_failed
-            total_skipped += suite_skipped
+            overall.update(counts)
             
-            print(f"\n📋 {suite_name.upper().replace('_', ' ')}:")
-            print(f"  Total: {suite_total}, Passed: {suite_passed}, Failed: {suite_failed}, Skipped: {suite_skipped}")
-            print(f"  Success Rate: {(suite_passed/suite_total)*100:.1f}%")
-        
-        print(f"\n🎯 OVERALL SUMMARY:")
-        print(f"  Total Tests: {total_tests}")
-        print(f"  Passed: {total_passed}")
-        print(f"  Failed: {total_failed}")
-        print(f"  Skipped: {total_skipped}")
-        print(f"  Overall Success Rate: {(total_passed/total_tests)*100:.1f}%")
-        
-        if self.start_time and self.end_time:
+            ap(f"\n📋 {suite_name.upper().replace('_', ' ')}:")
+            ap(f"  Total: {suite_total}, Passed: {suite_passed}, Failed: {suite_failed}, Skipped: {suite_skipped}")
+            ap(f"  Success Rate: {_pct(suite_passed, suite_total):.1f}%")
+        
+        total_passed, total_failed, total_skipped = overall[True], overall[False], overall[None]
+        
+        ap(f"\n🎯 OVERALL SUMMARY:")
+        ap(f"  Total Tests: {total_tests}")
+        ap(f"  Passed: {total_passed}")
+        ap(f"  Failed: {total_failed}")
+        ap(f"  Skipped: {total_skipped}")
+        ap(f"  Overall Success Rate: {_pct(total_passed, total_tests):.1f}%")
+        
+        if self.start_time is not None and self.end_time is not None:
             duration = self.end_time - self.start_time
-            print(f"  Total Duration: {duration:.2f} seconds")
+            ap(f"  Total Duration: {duration:.2f} seconds")
+        
+        # Slowest suites first
+        if self.suite_timings:
+            ap(f"\n⏱️  SUITE TIMINGS:")
+            for suite_name, elapsed in sorted(self.suite_timings.items(), key=lambda item: item[1], reverse=True):
+                ap(f"  {suite_name.upper().replace('_', ' '):<20} {elapsed:8.2f}s")
         
         # Detailed results by suite
-        print(f"\n📋 DETAILED RESULTS BY SUITE:")
+        ap(f"\n📋 DETAILED RESULTS BY SUITE:")
         for suite_name, suite_results in self.all_results.items():
-            print(f"\n  {suite_name.upper().replace('_', ' ')}:")
-            for test_name, result in suite_results.items():
-                if result is True:
-                    status = "✅ PASS"
-                elif result is False:
-                    status = "❌ FAIL"
-                else:
-                    status = "⏭️  SKIP"
-                print(f"    {test_name}: {status}")
+            ap(f"\n  {suite_name.upper().replace('_', ' ')}:")
+            if suite_results:
+                skip = RESULT_STATUS[None]
+                ap("\n".join(f"    {test_name}: {RESULT_STATUS.get(result, skip)}"
+                             for test_name, result in suite_results.items()))
         
         # Final assessment
         if total_failed == 0:
-            print(f"\n🎉 ALL TESTS PASSED! The CDF Kafka MCP Server is fully functional.")
+            ap(f"\n🎉 ALL TESTS PASSED! The CDF Kafka MCP Server is fully functional.")
         elif total_failed <= total_tests * 0.2:  # Less than 20% failure rate
-            print(f"\n⚠️  MOSTLY SUCCESSFUL: {total_failed} tests failed, but core functionality works.")
+            ap(f"\n⚠️  MOSTLY SUCCESSFUL: {total_failed} tests failed, but core functionality works.")
         else:
-            print(f"\n❌ SIGNIFICANT ISSUES: {total_failed} tests failed. Review the logs above.")
+            ap(f"\n❌ SIGNIFICANT ISSUES: {total_failed} tests failed. Review the logs above.")
+        
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
     
     def save_results_to_file(self, filename: str = "test_results.json"):
         """Save test results to a JSON file"""
         try:
             results_data = {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "duration": self.end_time - self.start_time if self.end_time and self.start_time else None,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "duration": self.end_time - self.start_time if self.end_time is not None and self.start_time is not None else None,
+                "suite_timings": self.suite_timings,
                 "results": self.all_results
             }
             
-            with open(filename, 'w') as f:
-                json.dump(results_data, f, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(results_data, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(results_data, indent=2).encode()
+            with open(filename, 'wb') as f:
+                f.write(data)
             
             print(f"\n💾 Test results saved to {filename}")
         except Exception as e:
@@ -158,10 +341,18 @@ class ComprehensiveTester:
 
 async def main():
     """Main test runner"""
+    parser = argparse.ArgumentParser(description="Run the CDF Kafka MCP Server test suites")
+    parser.add_argument("--only", type=lambda value: value.split(","), default=None,
+                        help=f"Comma-separated subset of suites to run ({','.join(ComprehensiveTester.SUITES)})")
+    args = parser.parse_args()
+    unknown = set(args.only or ()) - ComprehensiveTester.SUITES.keys()
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+    
     tester = ComprehensiveTester()
     
     try:
-        await tester.run_all_tests()
+        await tester.run_all_tests(args.only)
     finally:
         tester.print_comprehensive_summary()
         tester.save_results_to_file()
@@ -10,41 +10,93 @@ import json
 import time
 import requests
 import base64
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence, Tuple
 
-def add_value_to_topic():
+import urllib3
+
+# The gateway uses a self-signed certificate; verification is disabled below
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Configuration, read once from the environment
+BASE_URL = os.getenv("CDP_REST_BASE_URL", "https://your-cdp-cluster.example.com:443")
+USERNAME = os.getenv("CDP_REST_USERNAME", "your-username")
+PASSWORD = os.getenv("CDP_REST_PASSWORD", "your-password")
+CLUSTER_ID = "irb-kakfa-only"
+TOPIC_NAME = "mcptesttopic"
+
+HEADERS = {
+    'Authorization': 'Basic ' + base64.b64encode(f"{USERNAME}:{PASSWORD}".encode()).decode(),
+    'Accept': 'application/json',
+    'Content-Type': 'application/json',
+    'User-Agent': 'CDF-Kafka-MCP-Server/1.0'
+}
+
+_PROXY = f"{BASE_URL}/irb-kakfa-only/cdp-proxy"
+
+# Endpoints tried for producing messages
+PRODUCE_ENDPOINTS = (
+    f"{_PROXY}/kafka-rest/clusters/{CLUSTER_ID}/topics/{TOPIC_NAME}/records",
+    f"{_PROXY}/kafka-rest/clusters/default/topics/{TOPIC_NAME}/records",
+    f"{_PROXY}/kafka-topics/{TOPIC_NAME}/records",
+    f"{_PROXY}/kafka/{TOPIC_NAME}/records",
+)
+
+# Endpoints tried for creating the topic when producing fails
+CREATE_ENDPOINTS = (
+    f"{_PROXY}/kafka-rest/clusters/{CLUSTER_ID}/topics",
+    f"{_PROXY}/kafka-rest/clusters/default/topics",
+    f"{_PROXY}/kafka-topics",
+)
+
+
+def report_status(label: str, endpoint: str, response: requests.Response, ok_statuses: Sequence[int]) -> bool:
+    """Print the outcome of one POST and return whether it was accepted."""
+    print(f"🔄 {label} {endpoint}: {response.status_code}")
+    if response.status_code in ok_statuses:
+        return True
+    elif response.status_code == 404:
+        print("   ❌ Endpoint not found")
+    elif response.status_code == 401:
+        print("   ❌ Authentication failed")
+    elif response.status_code == 403:
+        print("   ❌ Access forbidden")
+    else:
+        print(f"   ❌ Unexpected status: {response.status_code} - {response.text[:200]}")
+    return False
+
+
+async def post_in_order(session: requests.Session, endpoints: Sequence[str], payload: Dict[str, Any],
+                        ok_statuses: Sequence[int], label: str) -> Optional[Tuple[str, requests.Response]]:
+    """POST the payload to each endpoint in turn, stopping at the first accepted reply.
+    
+    Used for requests that are not idempotent, where trying a second
+    endpoint after a success could apply the request twice.
+    """
+    for endpoint in endpoints:
+        try:
+            response = await asyncio.to_thread(session.post, endpoint, json=payload, timeout=10)
+        except Exception as e:
+            print(f"❌ {label} request failed: {e}")
+            continue
+        if report_status(label, endpoint, response, ok_statuses):
+            return endpoint, response
+    return None
+
+
+async def add_value_to_topic():
     """Add a value to mcptesttopic using direct HTTP requests."""
     print("🚀 Adding value to mcptesttopic")
     print("=" * 50)
     
-    # Configuration
-    base_url = os.getenv("CDP_REST_BASE_URL", "https://your-cdp-cluster.example.com:443")
-    username = os.getenv("CDP_REST_USERNAME", "your-username")
-    password = os.getenv("CDP_REST_PASSWORD", "your-password")
-    cluster_id = "irb-kakfa-only"
-    topic_name = "mcptesttopic"
-    
     # Create session with authentication
     session = requests.Session()
-    credentials = f"{username}:{password}"
-    encoded_credentials = base64.b64encode(credentials.encode()).decode()
-    
-    session.headers.update({
-        'Authorization': f'Basic {encoded_credentials}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json',
-        'User-Agent': 'CDF-Kafka-MCP-Server/1.0'
-    })
+    session.headers.update(HEADERS)
     session.verify = False
     
-    # Disable SSL warnings
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    
     print("🔍 Testing connection...")
     try:
         # Test basic connectivity
-        response = session.get(f"{base_url}/api/health", timeout=10)
+        response = await asyncio.to_thread(session.get, f"{BASE_URL}/api/health", timeout=10)
         print(f"Connection test: {response.status_code}")
         
         if response.status_code in [200, 404]:
@@ -56,70 +108,33 @@ def add_value_to_topic():
         print(f"❌ Connection test failed: {e}")
         return
     
-    print(f"\n📝 Attempting to add value to topic '{topic_name}'...")
-    
-    # Try different endpoints for producing messages
-    endpoints_to_try = [
-        f"{base_url}/irb-kakfa-only/cdp-proxy/kafka-rest/clusters/{cluster_id}/topics/{topic_name}/records",
-        f"{base_url}/irb-kakfa-only/cdp-proxy/kafka-rest/clusters/default/topics/{topic_name}/records",
-        f"{base_url}/irb-kakfa-only/cdp-proxy/kafka-topics/{topic_name}/records",
-        f"{base_url}/irb-kakfa-only/cdp-proxy/kafka/{topic_name}/records"
-    ]
+    print(f"\n📝 Attempting to add value to topic '{TOPIC_NAME}'...")
     
+    ts = int(time.time())
     message_data = {
-        "value": f"Hello from MCP Server! Timestamp: {int(time.time())}",
+        "value": f"Hello from MCP Server! Timestamp: {ts}",
         "key": "test-key-1",
         "headers": {
             "source": "mcp-server",
-            "timestamp": str(int(time.time())),
+            "timestamp": str(ts),
             "version": "1.0"
         }
     }
     
-    success = False
-    for i, endpoint in enumerate(endpoints_to_try):
-        print(f"\n🔄 Trying endpoint {i+1}: {endpoint}")
-        try:
-            response = session.post(endpoint, json=message_data, timeout=10)
-            print(f"Response status: {response.status_code}")
-            print(f"Response headers: {dict(response.headers)}")
-            
-            if response.status_code == 200:
-                print("✅ Message sent successfully!")
-                print(f"Response: {response.text}")
-                success = True
-                break
-            elif response.status_code == 201:
-                print("✅ Message created successfully!")
-                print(f"Response: {response.text}")
-                success = True
-                break
-            elif response.status_code == 404:
-                print("❌ Endpoint not found")
-            elif response.status_code == 401:
-                print("❌ Authentication failed")
-            elif response.status_code == 403:
-                print("❌ Access forbidden")
-            else:
-                print(f"❌ Unexpected status: {response.status_code}")
-                print(f"Response: {response.text[:200]}")
-                
-        except Exception as e:
-            print(f"❌ Request failed: {e}")
+    # Producing is not idempotent, so the endpoints are tried one at a time
+    accepted = await post_in_order(session, PRODUCE_ENDPOINTS, message_data, (200, 201), "Produce via")
+    success = accepted is not None
+    if success:
+        print("✅ Message sent successfully!")
+        print(f"Response: {accepted[1].text}")
     
     if not success:
         print("\n❌ All endpoints failed. Trying alternative approach...")
         
         # Try to create the topic first
         print("\n🔧 Attempting to create topic...")
-        create_endpoints = [
-            f"{base_url}/irb-kakfa-only/cdp-proxy/kafka-rest/clusters/{cluster_id}/topics",
-            f"{base_url}/irb-kakfa-only/cdp-proxy/kafka-rest/clusters/default/topics",
-            f"{base_url}/irb-kakfa-only/cdp-proxy/kafka-topics"
-        ]
-        
         topic_config = {
-            "name": topic_name,
+            "name": TOPIC_NAME,
             "partitions": 1,
             "replication_factor": 1,
             "config": {
@@ -128,20 +143,10 @@ def add_value_to_topic():
             }
         }
         
-        for i, endpoint in enumerate(create_endpoints):
-            print(f"\n🔄 Trying create endpoint {i+1}: {endpoint}")
-            try:
-                response = session.post(endpoint, json=topic_config, timeout=10)
-                print(f"Create response status: {response.status_code}")
-                
-                if response.status_code in [200, 201, 409]:  # 409 = already exists
-                    print("✅ Topic creation/verification successful!")
-                    break
-                else:
-                    print(f"❌ Create failed: {response.status_code} - {response.text[:200]}")
-                    
-            except Exception as e:
-                print(f"❌ Create request failed: {e}")
+        # The endpoints may address different clusters, so stop at the first
+        # one that creates (or already has) the topic
+        if await post_in_order(session, CREATE_ENDPOINTS, topic_config, (200, 201, 409), "Create via"):
+            print("✅ Topic creation/verification successful!")
     
     print(f"\n🎯 Summary:")
     if success:
@@ -154,5 +159,6 @@ def add_value_to_topic():
         print("- CDP REST API endpoints not available")
         print("- Network connectivity issues")
 
+
 if __name__ == "__main__":
-    add_value_to_topic()
+    asyncio.run(add_value_to_topic())
@@ -9,15 +9,112 @@ import sys
 import os
 import json
 import time
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+# Tool replies are parsed with orjson when it is installed
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Tools are called in-process through call_tool_native, skipping the JSON
+# round trip; set MCP_TEST_JSON_TRANSPORT=1 to go through call_tool instead
+USE_JSON_TRANSPORT = os.getenv('MCP_TEST_JSON_TRANSPORT', '').lower() in ('1', 'true', 'yes')
+
+# Upper bound on batch requests in flight, tool calls run at once within a
+# batch, and worker threads for blocking client calls; keeps the CDP
+# endpoints from being flooded when every category runs together
+CONCURRENCY = int(os.getenv('MCP_TEST_CONCURRENCY', '8'))
+
+from _common import run
 from cdf_kafka_mcp_server.mcp_server import CDFKafkaMCPServer
 from mcp.types import CallToolRequest
 
+# Output lines of the test category running in the current task, if buffered
+_category_output: ContextVar[Optional[List[str]]] = ContextVar('category_output', default=None)
+
+
+@dataclass(slots=True)
+class ToolResult:
+    """Outcome of one tool call, as recorded in the test results."""
+    success: bool
+    count: int = 0
+    method: str = ''
+    message: str = ''
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_error(cls, error: Exception) -> 'ToolResult':
+        """Result for a call that failed before its reply could be read."""
+        return cls(False, message=str(error), extra={'error': str(error)})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict form, for writing the results file."""
+        return {'success': self.success, 'count': self.count, 'method': self.method,
+                'message': self.message, **self.extra}
+
+
+def _default_result(data: Dict[str, Any], arguments: Dict[str, Any]) -> ToolResult:
+    return ToolResult('error' not in data, message=str(data.get('status', 'ok')))
+
+
+def _listing(key: str, noun: str) -> Callable[[Dict[str, Any], Dict[str, Any]], ToolResult]:
+    """Adapter for tools that reply with a list under key and its count."""
+    def adapt(data: Dict[str, Any], arguments: Dict[str, Any]) -> ToolResult:
+        count = data.get('count', 0)
+        return ToolResult('error' not in data, count=count, method=data.get('method', ''),
+                          message=f"{count} {noun}", extra={key: data.get(key, [])})
+    return adapt
+
+
+def _sized(key: str, noun: str) -> Callable[[Dict[str, Any], Dict[str, Any]], ToolResult]:
+    """Adapter for tools that reply with a mapping under key."""
+    def adapt(data: Dict[str, Any], arguments: Dict[str, Any]) -> ToolResult:
+        items = data.get(key, {})
+        return ToolResult('error' not in data, count=len(items), message=f"{len(items)} {noun}",
+                          extra={key: items})
+    return adapt
+
+
+def _status(data: Dict[str, Any], arguments: Dict[str, Any]) -> ToolResult:
+    return ToolResult('error' not in data, message=data.get('status', 'unknown'))
+
+
+# Turns each tool's JSON reply into a ToolResult; tools not listed only
+# pass or fail on whether the reply carries an error
+_ADAPTERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], ToolResult]] = {
+    'test_connection': lambda data, arguments: ToolResult(
+        data.get('connected', False), method=data.get('method', 'unknown'),
+        message=data.get('message', 'No message')),
+    'get_health_status': lambda data, arguments: ToolResult(
+        data.get('overall_status') != 'unhealthy', message=data.get('overall_status', 'unknown')),
+    'list_topics': _listing('topics', 'topics found'),
+    'create_topic': lambda data, arguments: ToolResult('error' not in data, message=arguments['name']),
+    'get_topic_info': lambda data, arguments: ToolResult(
+        'error' not in data, message=data.get('topic', data.get('name', 'unknown'))),
+    'produce_message': lambda data, arguments: ToolResult(
+        'error' not in data, message=data.get('message', 'No message')),
+    'consume_messages': _listing('messages', 'messages consumed'),
+    'list_connectors': _listing('connectors', 'connectors found'),
+    'get_connector_status': _status,
+    'test_authentication': lambda data, arguments: ToolResult(
+        data.get('authenticated', False), method=data.get('method', 'unknown'),
+        message=str(data.get('authenticated', False))),
+    'discover_auth_endpoints': _sized('endpoints', 'endpoints found'),
+    'get_cdp_clusters': _listing('clusters', 'clusters found'),
+    'get_cdp_apis': _listing('apis', 'APIs found'),
+    'get_cdp_service_health': _sized('services', 'services checked'),
+    'get_service_metrics': _sized('metrics', 'metrics collected'),
+    'run_health_check': _status,
+}
+
+
 class CDPCloudMCPTester:
     """Comprehensive tester for all MCP tools against CDP Cloud."""
     
@@ -26,7 +123,21 @@ class CDPCloudMCPTester:
         self.config_file = config_file
         self.server = None
         self.test_results = {}
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
+        # Wall-clock second the run started; names the topic, messages and results file
+        self._suite_ts = int(time.time())
+        # CallToolRequest models keyed by tool name and serialized arguments
+        self._req_cache: Dict[Tuple[str, str], CallToolRequest] = {}
+        # Finished categories' output blocks, written out by _drain_logs
+        self._log_q: Optional[asyncio.Queue] = None
+        # Pass/fail counts, kept up to date as category results are recorded
+        self._pass = 0
+        self._fail = 0
+        self._sem = asyncio.Semaphore(CONCURRENCY)
+        # Topic created by the topic tests and reused by the message tests;
+        # the event is set once the create_topic call has returned
+        self.test_topic = f"mcp-test-topic-{self._suite_ts}"
+        self._topic_ready = asyncio.Event()
         
     async def initialize_server(self) -> bool:
         """Initialize the MCP server."""
@@ -39,355 +150,219 @@ class CDPCloudMCPTester:
             print(f"❌ Failed to initialize MCP server: {e}")
             return False
     
-    async def test_connection_tools(self) -> Dict[str, Any]:
-        """Test connection-related tools."""
-        print("\n🔍 Testing Connection Tools")
-        print("=" * 50)
-        
-        results = {}
-        
-        # Test 1: test_connection
+    @staticmethod
+    def _say(text: str = ""):
+        """Print, or hold the line for later if the current category's output is buffered."""
+        lines = _category_output.get()
+        if lines is None:
+            print(text)
+        else:
+            lines.append(text)
+    
+    async def _buffered(self, category_name: str, test_func):
+        """Run a test category, queue its output as one block and return its results (or exception)."""
+        lines = []
+        _category_output.set(lines)
         try:
-            print("Testing: test_connection")
-            request = CallToolRequest(params={'name': 'test_connection', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['test_connection'] = {
-                'success': data.get('connected', False),
-                'message': data.get('message', 'No message'),
-                'method': data.get('method', 'unknown'),
-                'data': data
-            }
-            print(f"  ✅ test_connection: {data.get('connected', False)}")
+            outcome = await test_func()
         except Exception as e:
-            results['test_connection'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ test_connection failed: {e}")
-        
-        # Test 2: get_health_status
+            outcome = e
+            lines.append(f"❌ {category_name} failed: {e}")
+        if lines:
+            self._log_q.put_nowait("\n".join(lines))
+        return outcome
+    
+    async def _drain_logs(self):
+        """Write queued output blocks to stdout, several per write, until a None arrives."""
+        while True:
+            batch = [await self._log_q.get()]
+            while len(batch) < 64 and not self._log_q.empty():
+                batch.append(self._log_q.get_nowait())
+            done = None in batch
+            blocks = [block for block in batch if block is not None]
+            if blocks:
+                sys.stdout.write("\n".join(blocks) + "\n")
+                sys.stdout.flush()
+            if done:
+                return
+    
+    async def _warmup(self):
+        """Authenticate once before the categories fan out, so they share the established session."""
+        print("🔑 Warming up CDP authentication...")
+        data = await self.server.call_tool_native('test_authentication')
+        if data.get('authenticated'):
+            print(f"✅ Authenticated via {data.get('method', 'unknown')}")
+        else:
+            print(f"⚠️ Warmup authentication failed: {data.get('error', 'not authenticated')}")
+    
+    def _req(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> CallToolRequest:
+        """Get the CallToolRequest for a tool call, validating each distinct one only once."""
+        arguments = arguments or {}
+        key = (name, json.dumps(arguments, sort_keys=True, default=str))
+        request = self._req_cache.get(key)
+        if request is None:
+            request = self._req_cache[key] = CallToolRequest(params={'name': name, 'arguments': arguments})
+        return request
+    
+    async def _batch_call(self, calls: List[Tuple[str, Dict[str, Any]]], max_concurrent: int = CONCURRENCY) -> List[Dict[str, Any]]:
+        """Run tool calls through one batch_execute request, returning each call's JSON reply in order."""
+        arguments = {
+            'calls': [{'name': name, 'arguments': arguments} for name, arguments in calls],
+            'maxConcurrent': max_concurrent
+        }
+        async with self._sem:
+            if USE_JSON_TRANSPORT:
+                result = await self.server.call_tool(self._req('batch_execute', arguments))
+                data = _loads(result.content[0].text)
+            else:
+                data = await self.server.call_tool_native('batch_execute', arguments)
+        if 'error' in data:
+            raise RuntimeError(data['error'])
+        return [entry.get('result', {'error': 'skipped'}) for entry in data['results']]
+    
+    @staticmethod
+    def _summarize_result(name: str, arguments: Dict[str, Any], data: Dict[str, Any]) -> Tuple['ToolResult', str]:
+        """Build one tool's result and the line to print for it."""
         try:
-            print("Testing: get_health_status")
-            request = CallToolRequest(params={'name': 'get_health_status', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_health_status'] = {
-                'success': data.get('overall_status') != 'unhealthy',
-                'status': data.get('overall_status', 'unknown'),
-                'data': data
-            }
-            print(f"  ✅ get_health_status: {data.get('overall_status', 'unknown')}")
+            result = _ADAPTERS.get(name, _default_result)(data, arguments)
+            result.extra['data'] = data
+            return result, f"  ✅ {name}: {result.message}"
         except Exception as e:
-            results['get_health_status'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_health_status failed: {e}")
-        
-        return results
+            return ToolResult.from_error(e), f"  ❌ {name} failed: {e}"
     
-    async def test_topic_tools(self) -> Dict[str, Any]:
-        """Test topic-related tools."""
-        print("\n📋 Testing Topic Tools")
-        print("=" * 50)
-        
+    async def _run_category(self, specs: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, 'ToolResult']:
+        """Run a category's tool calls as one batch and print their outcomes in spec order."""
+        for name, _ in specs:
+            self._say(f"Testing: {name}")
         results = {}
-        
-        # Test 1: list_topics
         try:
-            print("Testing: list_topics")
-            request = CallToolRequest(params={'name': 'list_topics', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['list_topics'] = {
-                'success': 'error' not in data,
-                'topics': data.get('topics', []),
-                'count': data.get('count', 0),
-                'method': data.get('method', 'unknown'),
-                'data': data
-            }
-            print(f"  ✅ list_topics: {data.get('count', 0)} topics found")
+            replies = await self._batch_call(specs)
         except Exception as e:
-            results['list_topics'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ list_topics failed: {e}")
+            for name, _ in specs:
+                results[name] = ToolResult.from_error(e)
+                self._say(f"  ❌ {name} failed: {e}")
+            return results
+        for (name, arguments), data in zip(specs, replies):
+            results[name], line = self._summarize_result(name, arguments, data)
+            self._say(line)
+        return results
+    
+    async def test_connection_tools(self) -> Dict[str, Any]:
+        """Test connection-related tools."""
+        self._say("\n🔍 Testing Connection Tools")
+        self._say("=" * 50)
         
-        # Test 2: create_topic
+        return await self._run_category([
+            ('test_connection', {}),
+            ('get_health_status', {}),
+        ])
+    
+    async def test_topic_tools(self) -> Dict[str, Any]:
+        """Test topic-related tools."""
+        self._say("\n📋 Testing Topic Tools")
+        self._say("=" * 50)
+        
+        topic_name = self.test_topic
         try:
-            print("Testing: create_topic")
-            topic_name = f"mcp-test-topic-{int(time.time())}"
-            request = CallToolRequest(params={
-                'name': 'create_topic',
-                'arguments': {
+            results = await self._run_category([
+                ('list_topics', {}),
+                ('create_topic', {
                     'name': topic_name,
                     'partitions': 1,
                     'replication_factor': 1
-                }
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['create_topic'] = {
-                'success': 'error' not in data,
-                'topic': topic_name,
-                'data': data
-            }
-            print(f"  ✅ create_topic: {topic_name}")
-        except Exception as e:
-            results['create_topic'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ create_topic failed: {e}")
-        
-        # Test 3: get_topic_info
-        try:
-            print("Testing: get_topic_info")
-            request = CallToolRequest(params={
-                'name': 'get_topic_info',
-                'arguments': {'topic': 'mcptesttopic'}
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_topic_info'] = {
-                'success': 'error' not in data,
-                'data': data
-            }
-            print(f"  ✅ get_topic_info: {data.get('topic', 'unknown')}")
-        except Exception as e:
-            results['get_topic_info'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_topic_info failed: {e}")
-        
+                }),
+            ])
+        finally:
+            # Let the message tests go ahead even if creation failed
+            self._topic_ready.set()
+        results.update(await self._run_category([
+            ('get_topic_info', {'name': topic_name}),
+        ]))
         return results
     
     async def test_message_tools(self) -> Dict[str, Any]:
         """Test message-related tools."""
-        print("\n📝 Testing Message Tools")
-        print("=" * 50)
-        
-        results = {}
-        
-        # Test 1: produce_message
-        try:
-            print("Testing: produce_message")
-            request = CallToolRequest(params={
-                'name': 'produce_message',
-                'arguments': {
-                    'topic': 'mcptesttopic',
-                    'value': f'Test message from MCP Cloud Test at {int(time.time())}',
-                    'key': 'test-key-cloud'
-                }
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['produce_message'] = {
-                'success': 'error' not in data,
-                'data': data
-            }
-            print(f"  ✅ produce_message: {data.get('message', 'No message')}")
-        except Exception as e:
-            results['produce_message'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ produce_message failed: {e}")
-        
-        # Test 2: consume_messages
+        self._say("\n📝 Testing Message Tools")
+        self._say("=" * 50)
+        
+        # Produce to the topic the topic tests create, once it exists;
+        # consuming reads back what was just produced, so these two stay in order
+        topic_name = self.test_topic
+        await self._topic_ready.wait()
+        results = await self._run_category([
+            ('produce_message', {
+                'topic': topic_name,
+                'value': f'Test message from MCP Cloud Test at {self._suite_ts}',
+                'key': 'test-key-cloud'
+            }),
+        ])
+        results.update(await self._run_category([
+            ('consume_messages', {
+                'topic': topic_name,
+                'max_count': 500
+            }),
+        ]))
+        
+        # A burst of concurrent produces, so the producer's batching is exercised
+        self._say("Testing: produce_burst")
+        burst_size = 32
+        burst = [('produce_message', {
+            'topic': topic_name,
+            'value': f'Burst message {i} from MCP Cloud Test',
+            'key': f'test-key-burst-{i}'
+        }) for i in range(burst_size)]
         try:
-            print("Testing: consume_messages")
-            request = CallToolRequest(params={
-                'name': 'consume_messages',
-                'arguments': {
-                    'topic': 'mcptesttopic',
-                    'max_count': 5
-                }
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['consume_messages'] = {
-                'success': 'error' not in data,
-                'messages': data.get('messages', []),
-                'count': data.get('count', 0),
-                'data': data
-            }
-            print(f"  ✅ consume_messages: {data.get('count', 0)} messages consumed")
+            replies = await self._batch_call(burst, max_concurrent=burst_size)
+            failed = sum(1 for data in replies if 'error' in data)
+            sent = burst_size - failed
+            results['produce_burst'] = ToolResult(failed == 0, count=sent, message=f"{sent}/{burst_size} messages produced",
+                                                  extra={'failed': failed})
+            self._say(f"  ✅ produce_burst: {results['produce_burst'].message}")
         except Exception as e:
-            results['consume_messages'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ consume_messages failed: {e}")
-        
+            results['produce_burst'] = ToolResult.from_error(e)
+            self._say(f"  ❌ produce_burst failed: {e}")
         return results
     
     async def test_connector_tools(self) -> Dict[str, Any]:
         """Test connector-related tools."""
-        print("\n🔌 Testing Connector Tools")
-        print("=" * 50)
+        self._say("\n🔌 Testing Connector Tools")
+        self._say("=" * 50)
         
-        results = {}
-        
-        # Test 1: list_connectors
-        try:
-            print("Testing: list_connectors")
-            request = CallToolRequest(params={'name': 'list_connectors', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['list_connectors'] = {
-                'success': 'error' not in data,
-                'connectors': data.get('connectors', []),
-                'count': data.get('count', 0),
-                'data': data
-            }
-            print(f"  ✅ list_connectors: {data.get('count', 0)} connectors found")
-        except Exception as e:
-            results['list_connectors'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ list_connectors failed: {e}")
-        
-        # Test 2: get_connector_status
-        try:
-            print("Testing: get_connector_status")
-            request = CallToolRequest(params={
-                'name': 'get_connector_status',
-                'arguments': {'connector_name': 'test-connector'}
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_connector_status'] = {
-                'success': 'error' not in data,
-                'data': data
-            }
-            print(f"  ✅ get_connector_status: {data.get('status', 'unknown')}")
-        except Exception as e:
-            results['get_connector_status'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_connector_status failed: {e}")
-        
-        return results
+        return await self._run_category([
+            ('list_connectors', {}),
+            ('get_connector_status', {'connector_name': 'test-connector'}),
+        ])
     
     async def test_authentication_tools(self) -> Dict[str, Any]:
         """Test authentication-related tools."""
-        print("\n🔐 Testing Authentication Tools")
-        print("=" * 50)
-        
-        results = {}
+        self._say("\n🔐 Testing Authentication Tools")
+        self._say("=" * 50)
         
-        # Test 1: test_authentication
-        try:
-            print("Testing: test_authentication")
-            request = CallToolRequest(params={'name': 'test_authentication', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['test_authentication'] = {
-                'success': data.get('authenticated', False),
-                'method': data.get('method', 'unknown'),
-                'data': data
-            }
-            print(f"  ✅ test_authentication: {data.get('authenticated', False)}")
-        except Exception as e:
-            results['test_authentication'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ test_authentication failed: {e}")
-        
-        # Test 2: discover_auth_endpoints
-        try:
-            print("Testing: discover_auth_endpoints")
-            request = CallToolRequest(params={'name': 'discover_auth_endpoints', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['discover_auth_endpoints'] = {
-                'success': 'error' not in data,
-                'endpoints': data.get('endpoints', {}),
-                'data': data
-            }
-            print(f"  ✅ discover_auth_endpoints: {len(data.get('endpoints', {}))} endpoints found")
-        except Exception as e:
-            results['discover_auth_endpoints'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ discover_auth_endpoints failed: {e}")
-        
-        return results
+        return await self._run_category([
+            ('test_authentication', {}),
+            ('discover_auth_endpoints', {}),
+        ])
     
     async def test_cdp_specific_tools(self) -> Dict[str, Any]:
         """Test CDP-specific tools."""
-        print("\n☁️ Testing CDP-Specific Tools")
-        print("=" * 50)
-        
-        results = {}
-        
-        # Test 1: get_cdp_clusters
-        try:
-            print("Testing: get_cdp_clusters")
-            request = CallToolRequest(params={'name': 'get_cdp_clusters', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_cdp_clusters'] = {
-                'success': 'error' not in data,
-                'clusters': data.get('clusters', []),
-                'count': data.get('count', 0),
-                'data': data
-            }
-            print(f"  ✅ get_cdp_clusters: {data.get('count', 0)} clusters found")
-        except Exception as e:
-            results['get_cdp_clusters'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_cdp_clusters failed: {e}")
-        
-        # Test 2: get_cdp_apis
-        try:
-            print("Testing: get_cdp_apis")
-            request = CallToolRequest(params={'name': 'get_cdp_apis', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_cdp_apis'] = {
-                'success': 'error' not in data,
-                'apis': data.get('apis', []),
-                'count': data.get('count', 0),
-                'data': data
-            }
-            print(f"  ✅ get_cdp_apis: {data.get('count', 0)} APIs found")
-        except Exception as e:
-            results['get_cdp_apis'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_cdp_apis failed: {e}")
-        
-        # Test 3: get_cdp_service_health
-        try:
-            print("Testing: get_cdp_service_health")
-            request = CallToolRequest(params={'name': 'get_cdp_service_health', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_cdp_service_health'] = {
-                'success': 'error' not in data,
-                'services': data.get('services', {}),
-                'data': data
-            }
-            print(f"  ✅ get_cdp_service_health: {len(data.get('services', {}))} services checked")
-        except Exception as e:
-            results['get_cdp_service_health'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_cdp_service_health failed: {e}")
-        
-        return results
+        self._say("\n☁️ Testing CDP-Specific Tools")
+        self._say("=" * 50)
+        
+        return await self._run_category([
+            ('get_cdp_clusters', {}),
+            ('get_cdp_apis', {}),
+            ('get_cdp_service_health', {}),
+        ])
     
     async def test_monitoring_tools(self) -> Dict[str, Any]:
         """Test monitoring-related tools."""
-        print("\n📊 Testing Monitoring Tools")
-        print("=" * 50)
-        
-        results = {}
+        self._say("\n📊 Testing Monitoring Tools")
+        self._say("=" * 50)
         
-        # Test 1: get_service_metrics
-        try:
-            print("Testing: get_service_metrics")
-            request = CallToolRequest(params={'name': 'get_service_metrics', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['get_service_metrics'] = {
-                'success': 'error' not in data,
-                'metrics': data.get('metrics', {}),
-                'data': data
-            }
-            print(f"  ✅ get_service_metrics: {len(data.get('metrics', {}))} metrics collected")
-        except Exception as e:
-            results['get_service_metrics'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ get_service_metrics failed: {e}")
-        
-        # Test 2: run_health_check
-        try:
-            print("Testing: run_health_check")
-            request = CallToolRequest(params={'name': 'run_health_check', 'arguments': {}})
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
-            results['run_health_check'] = {
-                'success': 'error' not in data,
-                'status': data.get('status', 'unknown'),
-                'data': data
-            }
-            print(f"  ✅ run_health_check: {data.get('status', 'unknown')}")
-        except Exception as e:
-            results['run_health_check'] = {'success': False, 'error': str(e)}
-            print(f"  ❌ run_health_check failed: {e}")
-        
-        return results
+        return await self._run_category([
+            ('get_service_metrics', {}),
+            ('run_health_check', {}),
+        ])
     
     async def run_all_tests(self) -> Dict[str, Any]:
         """Run all MCP tool tests."""
@@ -400,6 +375,7 @@ class CDPCloudMCPTester:
         # Initialize server
         if not await self.initialize_server():
             return {'error': 'Failed to initialize MCP server'}
+        await self._warmup()
         
         # Run all test categories
         test_categories = [
@@ -412,13 +388,24 @@ class CDPCloudMCPTester:
             ('Monitoring Tools', self.test_monitoring_tools)
         ]
         
-        for category_name, test_func in test_categories:
-            try:
-                category_results = await test_func()
-                self.test_results[category_name] = category_results
-            except Exception as e:
-                print(f"❌ {category_name} failed: {e}")
-                self.test_results[category_name] = {'error': str(e)}
+        # The categories call different tools and only touch their own results,
+        # so they run together. Each one's output is kept together and handed
+        # to a single writer task as soon as that category finishes.
+        # One server (and its Kafka and HTTP clients) serves every category;
+        # release its connections once they have all finished
+        self._log_q = asyncio.Queue()
+        writer = asyncio.create_task(self._drain_logs())
+        try:
+            outcomes = await asyncio.gather(*(self._buffered(name, test_func) for name, test_func in test_categories))
+        finally:
+            self.server.close()
+            self._log_q.put_nowait(None)
+            await writer
+        for (category_name, _), outcome in zip(test_categories, outcomes):
+            if isinstance(outcome, Exception):
+                self.test_results[category_name] = {'error': str(outcome)}
+            else:
+                self._record(category_name, outcome)
         
         # Calculate summary
         self.test_results['summary'] = self.calculate_summary()
@@ -428,22 +415,18 @@ class CDPCloudMCPTester:
         
         return self.test_results
     
+    def _record(self, category: str, results: Dict[str, Any]):
+        """Store a category's results and add them to the pass/fail counts."""
+        self.test_results[category] = results
+        passed = sum(1 for test_result in results.values() if test_result.success)
+        self._pass += passed
+        self._fail += len(results) - passed
+    
     def calculate_summary(self) -> Dict[str, Any]:
         """Calculate test summary statistics."""
-        total_tests = 0
-        passed_tests = 0
-        failed_tests = 0
-        
-        for category, results in self.test_results.items():
-            if category == 'summary':
-                continue
-            if isinstance(results, dict) and 'error' not in results:
-                for test_name, test_result in results.items():
-                    total_tests += 1
-                    if test_result.get('success', False):
-                        passed_tests += 1
-                    else:
-                        failed_tests += 1
+        passed_tests = self._pass
+        failed_tests = self._fail
+        total_tests = passed_tests + failed_tests
         
         success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
         
@@ -452,7 +435,7 @@ class CDPCloudMCPTester:
             'passed_tests': passed_tests,
             'failed_tests': failed_tests,
             'success_rate': success_rate,
-            'duration': time.time() - self.start_time
+            'duration': time.perf_counter() - self.start_time
         }
     
     def print_final_results(self):
@@ -476,7 +459,7 @@ class CDPCloudMCPTester:
             print(f"\n{category}:")
             if isinstance(results, dict) and 'error' not in results:
                 for test_name, test_result in results.items():
-                    status = "✅ PASS" if test_result.get('success', False) else "❌ FAIL"
+                    status = "✅ PASS" if test_result.success else "❌ FAIL"
                     print(f"  {test_name}: {status}")
             else:
                 print(f"  ❌ Category failed: {results.get('error', 'Unknown error')}")
@@ -495,17 +478,39 @@ class CDPCloudMCPTester:
         print("3. Check authentication credentials and permissions")
         print("4. Test with different CDP environments if available")
 
+
+def _to_json(obj: Any) -> Any:
+    """Fallback for values the JSON encoder cannot write itself."""
+    if isinstance(obj, ToolResult):
+        return obj.as_dict()
+    return str(obj)
+
+
+def write_results(results_file: str, results: Dict[str, Any]):
+    """Serialize the test results and write them to results_file in one call."""
+    if orjson is not None:
+        # orjson would serialize ToolResult itself (nesting extra); pass it
+        # through to _to_json so both encoders write the same flat entries
+        payload = orjson.dumps(results, default=_to_json,
+                               option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS)
+    else:
+        payload = json.dumps(results, indent=2, default=_to_json).encode()
+    with open(results_file, 'wb') as f:
+        f.write(payload)
+
+
 async def main():
     """Main function to run CDP Cloud MCP tools tests."""
+    # Blocking Kafka/HTTP calls the server hands to threads share one bounded pool
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=CONCURRENCY))
     tester = CDPCloudMCPTester()
     results = await tester.run_all_tests()
     
-    # Save results to file
-    timestamp = int(time.time())
-    results_file = f"cdp_cloud_mcp_test_results_{timestamp}.json"
-    with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    # Save results to file, off the event loop
+    results_file = f"cdp_cloud_mcp_test_results_{tester._suite_ts}.json"
+    await asyncio.to_thread(write_results, results_file, results)
     print(f"\n💾 Results saved to: {results_file}")
 
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
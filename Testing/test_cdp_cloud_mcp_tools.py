@@ -45,9 +45,17 @@ class CDPCloudMCPTester:
             
             # Load configuration to verify it
             config = load_config(config_path)
-            logger.info(f"✅ Configuration loaded: {config.kafka.bootstrap_servers}")
-            logger.info(f"✅ Knox Gateway: {config.knox.gateway}")
-            logger.info(f"✅ Security Protocol: {config.kafka.security_protocol}")
+            # One machine-readable summary instead of a line per setting
+            summary = {
+                "config_path": config_path,
+                "kafka": {
+                    "bootstrap_servers": config.kafka.bootstrap_servers,
+                    "security_protocol": config.kafka.security_protocol,
+                    "sasl_mechanism": config.kafka.sasl_mechanism
+                },
+                "knox": {"gateway": config.knox.gateway}
+            }
+            logger.info(f"✅ Configuration loaded: {json.dumps(summary, default=str)}")
             
             # Initialize MCP server with config path
             self.server = CDFKafkaMCPServer(config_path)
@@ -113,6 +121,24 @@ class CDPCloudMCPTester:
                 "timestamp": time.time()
             }
     
+    async def wait_for_connector_state(self, connector_name: str,
+                                       target_states: tuple = ("RUNNING", "FAILED"),
+                                       timeout: float = 20.0, interval: float = 0.5) -> Optional[str]:
+        """Poll connector status until it reaches a target state or the timeout expires."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            result = await self.test_tool("get_connector_status", {"name": connector_name})
+            status = json.dumps(result.get("result", {}))
+            for state in target_states:
+                if state in status:
+                    logger.info(f"✅ Connector {connector_name} reached state {state}")
+                    return state
+            await asyncio.sleep(interval)
+        
+        logger.warning(f"⚠️ Connector {connector_name} did not reach {target_states} within {timeout}s")
+        return None
+    
     async def test_connection_tools(self):
         """Test connection and basic functionality tools."""
         logger.info("🔌 Testing connection tools...")
@@ -136,18 +162,28 @@ class CDPCloudMCPTester:
         # Test topic name
         test_topic = f"{self.test_topic_prefix}topic-{int(time.time())}"
         
-        tools = [
+        # Read-only checks with no ordering between them run together; the
+        # create, update and delete steps stay sequential around them
+        await self._run_tools_concurrently([
             ("list_topics", {}),
-            ("topic_exists", {"name": test_topic}),
-            ("create_topic", {
-                "name": test_topic,
-                "partitions": 3,
-                "replication_factor": 1,
-                "config": {"cleanup.policy": "delete"}
-            }),
+            ("topic_exists", {"name": test_topic})
+        ])
+        
+        self.test_results["create_topic"] = await self.test_tool("create_topic", {
+            "name": test_topic,
+            "partitions": 3,
+            "replication_factor": 1,
+            "config": {"cleanup.policy": "delete"}
+        })
+        await asyncio.sleep(0.5)
+        
+        await self._run_tools_concurrently([
             ("topic_exists", {"name": test_topic}),
             ("describe_topic", {"name": test_topic}),
-            ("get_topic_partitions", {"name": test_topic}),
+            ("get_topic_partitions", {"name": test_topic})
+        ])
+        
+        tools = [
             ("update_topic_config", {
                 "name": test_topic,
                 "config": {"retention.ms": "3600000"}
@@ -163,6 +199,12 @@ class CDPCloudMCPTester:
             # Small delay between topic operations
             await asyncio.sleep(0.5)
     
+    async def _run_tools_concurrently(self, tools: List[tuple]):
+        """Run independent read-only tools together, recording results in list order."""
+        results = await asyncio.gather(*(self.test_tool(tool_name, args) for tool_name, args in tools))
+        for (tool_name, _), result in zip(tools, results):
+            self.test_results[tool_name] = result
+    
     async def test_message_operations_tools(self):
         """Test message production and consumption tools."""
         logger.info("💬 Testing message operations tools...")
@@ -221,9 +263,8 @@ class CDPCloudMCPTester:
             })
         ]
         
-        for tool_name, args in tools:
-            result = await self.test_tool(tool_name, args)
-            self.test_results[tool_name] = result
+        # All of these are read-only, so issue them concurrently
+        await self._run_tools_concurrently(tools)
     
     async def test_connector_lifecycle_tools(self):
         """Test connector lifecycle management tools."""
@@ -243,15 +284,21 @@ class CDPCloudMCPTester:
         })
         
         # Wait for connector to start
-        await asyncio.sleep(2)
+        await self.wait_for_connector_state(connector_name)
         
-        # Test connector management tools
-        tools = [
+        # Read-only connector queries are independent, so run them together
+        read_tools = [
             ("get_connector", {"name": connector_name}),
             ("get_connector_status", {"name": connector_name}),
             ("get_connector_config", {"name": connector_name}),
             ("get_connector_tasks", {"name": connector_name}),
-            ("get_connector_active_topics", {"name": connector_name}),
+            ("get_connector_active_topics", {"name": connector_name})
+        ]
+        
+        await self._run_tools_concurrently(read_tools)
+        
+        # State-changing connector tools stay sequential
+        tools = [
             ("pause_connector", {"name": connector_name}),
             ("resume_connector", {"name": connector_name}),
             ("restart_connector", {"name": connector_name}),
@@ -4,31 +4,28 @@ Test CDP REST API integration with MCP server
 """
 
 import asyncio
-import sys
-import os
-import json
 import time
 from typing import Dict, List, Any
 
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
+from _common import call_tools, get_server, parse_result, tool_request, TEST_CONNECTION_REQ, LIST_TOPICS_REQ, LIST_CONNECTORS_REQ
 from cdf_kafka_mcp_server.mcp_server import CDFKafkaMCPServer
 from mcp.types import CallToolRequest
 
 class CDPRestIntegrationTester:
     """Test CDP REST API integration with MCP server."""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, server: CDFKafkaMCPServer = None):
         self.config_path = config_path or '../config/kafka_config.yaml'
-        self.server = None
+        self.server = server
         self.test_results = {}
     
     async def initialize_server(self) -> bool:
         """Initialize the MCP server."""
+        if self.server is not None:
+            return True
         try:
             print("🔧 Initializing MCP server with CDP REST API integration...")
-            self.server = CDFKafkaMCPServer(self.config_path)
+            self.server = get_server(self.config_path)
             print("✅ MCP server initialized successfully")
             return True
         except Exception as e:
@@ -39,12 +36,8 @@ class CDPRestIntegrationTester:
         """Test connection via CDP REST API."""
         print("\n🔍 Test 1: Connection Test")
         try:
-            request = CallToolRequest(params={
-                'name': 'test_connection',
-                'arguments': {}
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            result = await self.server.call_tool(TEST_CONNECTION_REQ)
+            data = parse_result(result)
             
             print(f"   Status: {data.get('connected', False)}")
             print(f"   Message: {data.get('message', 'No message')}")
@@ -62,12 +55,8 @@ class CDPRestIntegrationTester:
         """Test listing topics via CDP REST API."""
         print("\n🔍 Test 2: List Topics")
         try:
-            request = CallToolRequest(params={
-                'name': 'list_topics',
-                'arguments': {}
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            result = await self.server.call_tool(LIST_TOPICS_REQ)
+            data = parse_result(result)
             
             topics = data.get('topics', [])
             count = data.get('count', 0)
@@ -101,7 +90,7 @@ class CDPRestIntegrationTester:
                 }
             })
             result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            data = parse_result(result)
             
             success = 'error' not in data
             print(f"   Topic: {topic_name}")
@@ -131,7 +120,7 @@ class CDPRestIntegrationTester:
                 }
             })
             result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            data = parse_result(result)
             
             success = 'error' not in data
             print(f"   Topic: {topic_name}")
@@ -151,17 +140,28 @@ class CDPRestIntegrationTester:
         print("\n🔍 Test 5: Connector Operations")
         try:
             # Test list connectors
-            request = CallToolRequest(params={
-                'name': 'list_connectors',
-                'arguments': {}
-            })
-            result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            result = await self.server.call_tool(LIST_CONNECTORS_REQ)
+            data = parse_result(result)
             
             connectors = data.get('connectors', [])
             print(f"   Connectors found: {len(connectors)}")
             print(f"   Method: {data.get('method', 'Unknown')}")
             
+            # Probe every connector's status concurrently
+            names = [c if isinstance(c, str) else c.get('name', str(c)) for c in connectors]
+            statuses = await call_tools(
+                self.server,
+                [tool_request('get_connector_status', name=name) for name in names]
+            )
+            for name, status in zip(names, statuses):
+                if isinstance(status, BaseException):
+                    print(f"     {name}: status probe failed ({type(status).__name__})")
+                else:
+                    state = parse_result(status).get('status', {})
+                    if isinstance(state, dict):
+                        state = state.get('connector', {}).get('state', 'unknown')
+                    print(f"     {name}: {state}")
+            
             self.test_results['connector_operations'] = True
             return True
             
@@ -179,7 +179,7 @@ class CDPRestIntegrationTester:
                 'arguments': {}
             })
             result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            data = parse_result(result)
             
             overall_status = data.get('overall_status', 'unknown')
             services = data.get('services', {})
@@ -207,7 +207,7 @@ class CDPRestIntegrationTester:
                 'arguments': {}
             })
             result = await self.server.call_tool(request)
-            data = json.loads(result.content[0].text)
+            data = parse_result(result)
             
             connected = data.get('connected', False)
             print(f"   CDP Connected: {connected}")
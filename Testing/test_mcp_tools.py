@@ -7,13 +7,10 @@ Tests all MCP tools functionality including Kafka Connect operations
 import asyncio
 import json
 import os
-import sys
 import time
 from typing import Dict, List, Any
 
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
+from _common import format_topics
 from cdf_kafka_mcp_server.mcp_server import CDFKafkaMCPServer
 from cdf_kafka_mcp_server.config import Config
 
@@ -90,7 +87,7 @@ class MCPToolsTester:
             
             if result and "topics" in result:
                 topics = result["topics"]
-                print(f"✅ Successfully listed {len(topics)} topics: {topics}")
+                print(f"✅ Successfully listed {len(topics)} topics: {format_topics(topics)}")
                 self.test_results["list_topics"] = True
             else:
                 print(f"❌ Unexpected result format: {result}")
@@ -58,7 +58,8 @@ class CDPAuthenticator:
     """Comprehensive CDP authentication handler."""
     
     def __init__(self, base_url: str, credentials: AuthCredentials, 
-                 verify_ssl: bool = False, timeout: int = 30):
+                 verify_ssl: bool = False, timeout: int = 30,
+                 preloaded_endpoints: Optional[Dict[str, Any]] = None):
         """
         Initialize CDP authenticator.
         
@@ -67,6 +68,8 @@ class CDPAuthenticator:
             credentials: Authentication credentials
             verify_ssl: Whether to verify SSL certificates
             timeout: Request timeout in seconds
+            preloaded_endpoints: Result of an earlier discover_auth_endpoints()
+                against the same base_url, reused instead of probing again
         """
         self.base_url = base_url.rstrip('/')
         self.credentials = credentials
@@ -81,6 +84,9 @@ class CDPAuthenticator:
         self._auth_method: Optional[AuthMethod] = None
         self._last_auth_time: Optional[float] = None
         
+        # Discovered auth endpoints, kept until logout()
+        self._endpoints: Optional[Dict[str, Any]] = preloaded_endpoints
+        
         # CDP-specific endpoints
         self.auth_endpoints = {
             'oauth2_token': '/oauth2/token',
@@ -430,8 +436,22 @@ class CDPAuthenticator:
                 'method': self._auth_method.value if self._auth_method else 'unknown'
             }
     
+    def logout(self) -> None:
+        """Drop the current token and the discovered auth endpoints."""
+        self._current_token = None
+        self._auth_method = None
+        self._last_auth_time = None
+        self._endpoints = None
+    
     def discover_auth_endpoints(self) -> Dict[str, Any]:
-        """Discover available authentication endpoints."""
+        """Discover available authentication endpoints.
+        
+        The endpoints are probed once; later calls return the same result
+        until logout().
+        """
+        if self._endpoints is not None:
+            return self._endpoints
+        
         discovered = {}
         
         for name, endpoint in self.auth_endpoints.items():
@@ -454,13 +474,15 @@ class CDPAuthenticator:
                     'error': str(e)
                 }
         
+        self._endpoints = discovered
         return discovered
 
 class CDPAuthManager:
     """Manager for CDP authentication across multiple services."""
     
     def __init__(self, base_url: str, credentials: AuthCredentials, 
-                 verify_ssl: bool = False):
+                 verify_ssl: bool = False,
+                 preloaded_endpoints: Optional[Dict[str, Any]] = None):
         """
         Initialize CDP authentication manager.
         
@@ -468,10 +490,13 @@ class CDPAuthManager:
             base_url: CDP base URL
             credentials: Authentication credentials
             verify_ssl: Whether to verify SSL certificates
+            preloaded_endpoints: Discovered auth endpoints shared by every
+                service's authenticator
         """
         self.base_url = base_url
         self.credentials = credentials
         self.verify_ssl = verify_ssl
+        self.preloaded_endpoints = preloaded_endpoints
         
         # Service-specific authenticators
         self.authenticators = {}
@@ -487,7 +512,8 @@ class CDPAuthManager:
             self.authenticators[service] = CDPAuthenticator(
                 base_url=self.base_url,
                 credentials=self.credentials,
-                verify_ssl=self.verify_ssl
+                verify_ssl=self.verify_ssl,
+                preloaded_endpoints=self.preloaded_endpoints
             )
     
     def authenticate_service(self, service: str, method: Optional[AuthMethod] = None) -> AuthToken:
@@ -337,6 +337,10 @@ class CDPClient:
             health_info["overall_health"] = "unhealthy"
         
         return health_info
+    
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
 
 
 class CDPKafkaClient:
@@ -6,9 +6,9 @@ import time
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, FrozenSet, List, Optional, Any, Union
 
-from .config import Config, KafkaConfig
+from .config import Config, KafkaConfig, parse_bootstrap_server
 from .cdp_rest_client import CDPRestClient
 
 logger = logging.getLogger(__name__)
@@ -44,14 +44,18 @@ class ProduceMessageRequest:
 class CDPKafkaClient:
     """CDP-integrated Kafka client using REST APIs."""
     
+    # Seconds a topic listing is reused by topic_names() and topic_exists()
+    TOPIC_NAMES_TTL = 30.0
+    
     def __init__(self, config: Config):
         """Initialize CDP Kafka client."""
         self.config = config
         self.kafka_config = config.kafka
         
         # Initialize CDP REST client
+        host, port = parse_bootstrap_server(self.kafka_config.bootstrap_servers[0])
         self.cdp_client = CDPRestClient(
-            base_url=self.kafka_config.bootstrap_servers[0].split(':')[0] + ':' + str(self.kafka_config.bootstrap_servers[0].split(':')[1]),
+            base_url=f"{host}:{port}" if port else host,
             username=getattr(self.kafka_config, 'sasl_username', None),
             password=getattr(self.kafka_config, 'sasl_password', None),
             cluster_id=getattr(self.kafka_config, 'cluster_id', None),
@@ -62,6 +66,12 @@ class CDPKafkaClient:
         self._cluster_info = None
         self._cluster_id = None
         
+        # Topic names from the last successful list_topics call, and when it
+        # was made; other clients can create or delete topics, so the listing
+        # is only trusted for TOPIC_NAMES_TTL seconds
+        self._topic_names: Optional[FrozenSet[str]] = None
+        self._topic_names_at = 0.0
+        
         logger.info("CDP Kafka client initialized successfully")
     
     def _get_cluster_id(self) -> str:
@@ -145,18 +155,39 @@ class CDPKafkaClient:
             topics_data = self.cdp_client.get_topics(cluster_id)
             
             if isinstance(topics_data, list):
-                return [topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics_data]
+                topics = [topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics_data]
             elif isinstance(topics_data, dict) and 'topics' in topics_data:
-                return [topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics_data['topics']]
+                topics = [topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics_data['topics']]
             else:
                 logger.warning(f"Unexpected topics data format: {type(topics_data)}")
                 return []
+            
+            self._topic_names = frozenset(topics)
+            self._topic_names_at = time.monotonic()
+            return topics
         except Exception as e:
             logger.error(f"Failed to list topics via CDP REST API: {e}")
             return []
     
+    def topic_names(self, refresh: bool = False) -> FrozenSet[str]:
+        """Get topic names as a frozenset, reusing the last listing unless refresh is set."""
+        if refresh or self._fresh_topic_names() is None:
+            self.list_topics()
+        return self._topic_names or frozenset()
+    
+    def _fresh_topic_names(self) -> Optional[FrozenSet[str]]:
+        """The cached topic names, or None if there are none or they have expired."""
+        if self._topic_names is None or time.monotonic() - self._topic_names_at > self.TOPIC_NAMES_TTL:
+            return None
+        return self._topic_names
+    
     def topic_exists(self, topic_name: str) -> bool:
         """Check if topic exists via CDP REST API."""
+        # A recent listing that includes the topic answers without a request;
+        # a miss is checked against the API in case the topic is newer
+        topic_names = self._fresh_topic_names()
+        if topic_names is not None and topic_name in topic_names:
+            return True
         try:
             cluster_id = self._get_cluster_id()
             self.cdp_client.get_topic(topic_name, cluster_id)
@@ -176,6 +207,8 @@ class CDPKafkaClient:
                 config=config or {},
                 cluster_id=cluster_id
             )
+            if self._topic_names is not None:
+                self._topic_names = self._topic_names | {name}
             logger.info(f"Topic '{name}' created successfully via CDP REST API")
             return True
         except Exception as e:
@@ -237,6 +270,8 @@ class CDPKafkaClient:
         try:
             cluster_id = self._get_cluster_id()
             self.cdp_client.delete_topic(topic_name, cluster_id)
+            if self._topic_names is not None:
+                self._topic_names = self._topic_names - {topic_name}
             logger.info(f"Topic '{topic_name}' deleted successfully via CDP REST API")
             return True
         except Exception as e:
@@ -299,6 +334,46 @@ class CDPKafkaClient:
             logger.error(f"Failed to consume messages from topic '{topic}' via CDP REST API: {e}")
             return []
     
+    def consume_bulk(self, topic: str, max_messages: int = 500,
+                     consumer_group: str = "mcp-consumer",
+                     fetch_max_bytes: int = 1048576,
+                     fetch_max_wait_ms: int = 100) -> List[Message]:
+        """Consume up to max_messages in a single fetch via CDP REST API.
+        
+        Unlike consume_messages, the fetch is sized by bytes rather than by
+        message count, so one request returns as many records as fit.
+        """
+        try:
+            cluster_id = self._get_cluster_id()
+            messages_data = self.cdp_client.consume_messages(
+                topic_name=topic,
+                consumer_group=consumer_group,
+                max_messages=max_messages,
+                cluster_id=cluster_id,
+                max_bytes=fetch_max_bytes,
+                timeout_ms=fetch_max_wait_ms
+            )
+            
+            now = datetime.now()
+            messages = [
+                Message(
+                    topic=topic,
+                    partition=msg_data.get('partition', 0),
+                    offset=msg_data.get('offset', 0),
+                    key=msg_data.get('key'),
+                    value=msg_data.get('value', ''),
+                    headers=msg_data.get('headers', {}),
+                    timestamp=now
+                )
+                for msg_data in messages_data[:max_messages]
+            ]
+            
+            logger.info(f"Consumed {len(messages)} messages from topic '{topic}' in one fetch via CDP REST API")
+            return messages
+        except Exception as e:
+            logger.error(f"Failed to bulk consume messages from topic '{topic}' via CDP REST API: {e}")
+            return []
+    
     # ==================== KAFKA CONNECT OPERATIONS ====================
     
     def list_connectors(self) -> List[str]:
@@ -464,3 +539,7 @@ class CDPKafkaClient:
         except Exception as e:
             logger.error(f"Failed to discover endpoints via CDP REST API: {e}")
             return {"error": str(e)}
+    
+    def close(self) -> None:
+        """Close the underlying CDP REST client."""
+        self.cdp_client.close()
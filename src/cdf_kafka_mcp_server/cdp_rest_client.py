@@ -47,6 +47,9 @@ class CDPRestClient:
         self.verify_ssl = verify_ssl
         self.session = requests.Session()
         
+        # Topic each consumer instance is currently subscribed to, keyed by (cluster_id, consumer_group)
+        self._subscriptions: Dict[tuple, str] = {}
+        
         # Store individual endpoint configurations
         self.kafka_connect_endpoint = kafka_connect_endpoint
         self.kafka_rest_endpoint = kafka_rest_endpoint
@@ -257,8 +260,14 @@ class CDPRestClient:
         return self._handle_response(response)
     
     def consume_messages(self, topic_name: str, consumer_group: str = "mcp-consumer",
-                        max_messages: int = 10, cluster_id: str = None) -> List[Dict[str, Any]]:
-        """Consume messages from a topic."""
+                        max_messages: int = 10, cluster_id: str = None,
+                        max_bytes: int = None, timeout_ms: int = None) -> List[Dict[str, Any]]:
+        """Consume messages from a topic.
+        
+        Args:
+            max_bytes: Maximum response size for the fetch (defaults to 1KB per message)
+            timeout_ms: Maximum time the REST proxy may wait to fill the fetch
+        """
         cluster_id = cluster_id or self.cluster_id
         if not cluster_id:
             raise Exception("Cluster ID is required")
@@ -269,14 +278,35 @@ class CDPRestClient:
         subscribe_endpoint = f"{self.endpoints['kafka_rest']}/clusters/{cluster_id}/consumers/{consumer_group}/instances/mcp-instance/subscription"
         subscribe_data = {"topics": [topic_name]}
         
-        try:
-            self._make_request('POST', subscribe_endpoint, json=subscribe_data)
-        except Exception as e:
-            logger.warning(f"Failed to subscribe to topic: {e}")
+        def subscribe() -> None:
+            try:
+                response = self._make_request('POST', subscribe_endpoint, json=subscribe_data)
+                if response.status_code < 300:
+                    self._subscriptions[subscription_key] = topic_name
+            except Exception as e:
+                logger.warning(f"Failed to subscribe to topic: {e}")
+        
+        # Reuse the existing consumer instance subscription when it already covers this topic
+        subscription_key = (cluster_id, consumer_group)
+        if self._subscriptions.get(subscription_key) != topic_name:
+            subscribe()
         
         # Consume messages
-        response = self._make_request('GET', endpoint, params={"max_bytes": max_messages * 1024})
-        return self._handle_response(response)
+        params = {"max_bytes": max_bytes or max_messages * 1024}
+        if timeout_ms is not None:
+            params["timeout"] = timeout_ms
+        try:
+            response = self._make_request('GET', endpoint, params=params)
+            if response.status_code == 404 and subscription_key in self._subscriptions:
+                # The server-side consumer instance has expired; subscribe again and retry once
+                self._subscriptions.pop(subscription_key, None)
+                subscribe()
+                response = self._make_request('GET', endpoint, params=params)
+            return self._handle_response(response)
+        except Exception:
+            # Don't trust the cached subscription after a failed fetch
+            self._subscriptions.pop(subscription_key, None)
+            raise
     
     # ==================== KAFKA CONNECT API ====================
     
@@ -743,3 +773,7 @@ class CDPRestClient:
                 "topic": topic_name,
                 "method": "kafka_connect_api"
             }
+    
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
@@ -5,13 +5,36 @@ Configuration management for CDF Kafka MCP Server.
 import os
 import re
 from pathlib import Path
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Union, Dict, Any, Tuple
 
 import yaml
 from pydantic import BaseModel, field_validator, Field
 from dotenv import load_dotenv
 
 
+# host:port bootstrap server entry, validated in one match
+_BOOTSTRAP_RE = re.compile(r'^([^:\s]+):(\d{1,5})$')
+
+
+# Producer batching presets: send immediately, or wait up to linger_ms to
+# fill larger batches for higher throughput
+PRODUCER_PROFILES: Dict[str, Dict[str, int]] = {
+    "latency": {"linger_ms": 0, "batch_size": 16384},
+    "throughput": {"linger_ms": 100, "batch_size": 65536},
+}
+
+
+def parse_bootstrap_server(server: str) -> Tuple[str, Optional[int]]:
+    """Split a bootstrap server entry into host and port.
+
+    The port is None when the entry has no valid numeric port.
+    """
+    match = _BOOTSTRAP_RE.match(server.strip())
+    if match:
+        return match.group(1), int(match.group(2))
+    return server.strip().split(':', 1)[0], None
+
+
 def substitute_variables(data: Any) -> Any:
     """Substitute environment variables in configuration data."""
     if isinstance(data, str):
@@ -102,6 +125,17 @@ class KafkaConfig(BaseModel):
     tls_cert: Optional[str] = Field(None, description="TLS certificate file")
     tls_key: Optional[str] = Field(None, description="TLS private key file")
     timeout: int = Field(30, description="Request timeout in seconds")
+    api_version: str = Field("2.6.0", description="Broker API version to pin, or 'auto' to probe it")
+    metadata_max_age_ms: int = Field(300000, description="Maximum age of cached cluster metadata before a refresh")
+    compression_type: Optional[str] = Field(None, description="Producer compression codec")
+    producer_profile: str = Field("latency", description="Producer batching profile (latency or throughput)")
+    linger_ms: Optional[int] = Field(None, description="Producer linger time; overrides the profile")
+    batch_size: Optional[int] = Field(None, description="Producer batch size in bytes; overrides the profile")
+    fetch_min_bytes: int = Field(1, description="Minimum bytes the broker accumulates before answering a fetch")
+    fetch_max_wait_ms: int = Field(500, description="Maximum time the broker waits to satisfy fetch_min_bytes")
+    fetch_max_bytes: int = Field(52428800, description="Maximum bytes returned by a single fetch")
+    max_poll_records: int = Field(500, description="Maximum records returned by a single poll")
+    receive_buffer_bytes: Optional[int] = Field(None, description="Consumer socket receive buffer size (OS default if unset)")
 
     @field_validator('security_protocol')
     def validate_security_protocol(cls, v: str) -> str:
@@ -120,6 +154,49 @@ class KafkaConfig(BaseModel):
                 raise ValueError(f"Invalid sasl_mechanism: {v}, must be one of {valid_mechanisms}")
         return v
 
+    @field_validator('compression_type')
+    def validate_compression_type(cls, v: Optional[str]) -> Optional[str]:
+        """Validate producer compression codec."""
+        if v is not None:
+            v = v.lower()
+            if v == "none":
+                return None
+            valid_codecs = ["gzip", "snappy", "lz4", "zstd"]
+            if v not in valid_codecs:
+                raise ValueError(f"Invalid compression_type: {v}, must be one of {valid_codecs}")
+        return v
+
+    @field_validator('api_version')
+    def validate_api_version(cls, v: str) -> str:
+        """Validate broker API version."""
+        v = v.strip().lower()
+        if v != "auto" and not re.match(r'^\d+(\.\d+){1,2}$', v):
+            raise ValueError(f"Invalid api_version: {v}, must be 'auto' or a dotted version such as 2.6.0")
+        return v
+
+    def api_version_tuple(self) -> Optional[Tuple[int, ...]]:
+        """Get the pinned API version as a tuple, or None to let the client probe."""
+        if self.api_version == "auto":
+            return None
+        return tuple(int(part) for part in self.api_version.split('.'))
+
+    @field_validator('producer_profile')
+    def validate_producer_profile(cls, v: str) -> str:
+        """Validate producer batching profile."""
+        v = v.lower()
+        if v not in PRODUCER_PROFILES:
+            raise ValueError(f"Invalid producer_profile: {v}, must be one of {list(PRODUCER_PROFILES)}")
+        return v
+
+    def producer_batching(self) -> Dict[str, int]:
+        """Get the effective producer linger_ms and batch_size."""
+        batching = dict(PRODUCER_PROFILES[self.producer_profile])
+        if self.linger_ms is not None:
+            batching['linger_ms'] = self.linger_ms
+        if self.batch_size is not None:
+            batching['batch_size'] = self.batch_size
+        return batching
+
     @field_validator('bootstrap_servers')
     def validate_bootstrap_servers(cls, v: Union[str, List[str]]) -> List[str]:
         """Convert bootstrap servers to list."""
@@ -226,6 +303,8 @@ def load_config(config_path: Optional[str] = None) -> Config:
             'retry_backoff_ms': int(os.getenv('KAFKA_RETRY_BACKOFF_MS', '1000')),
             'max_retry_attempts': int(os.getenv('KAFKA_MAX_RETRY_ATTEMPTS', '3')),
             'auth_method': os.getenv('KAFKA_AUTH_METHOD'),
+            'compression_type': os.getenv('KAFKA_COMPRESSION_TYPE'),
+            'producer_profile': os.getenv('KAFKA_PRODUCER_PROFILE', 'latency'),
         },
         'knox': {
             'gateway': os.getenv('KNOX_GATEWAY'),
@@ -2,19 +2,41 @@
 Kafka client implementation with Knox authentication support.
 """
 
+import ssl
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Union
 
 from kafka import KafkaProducer, KafkaConsumer, KafkaAdminClient
 from kafka.admin import ConfigResource, ConfigResourceType, NewTopic
-from kafka.errors import KafkaError, TopicAlreadyExistsError, UnknownTopicOrPartitionError
+from kafka.errors import KafkaError, TopicAlreadyExistsError, UnknownTopicOrPartitionError, for_code
 from kafka.structs import TopicPartition
 
-from .config import Config, KafkaConfig
+from .config import Config, KafkaConfig, parse_bootstrap_server
 from .knox_client import KnoxClient, KnoxError
 
+# Topics sent per CreateTopics request; the controller handles a batch in one pass
+CREATE_TOPICS_BATCH_SIZE = 4096
+
+
+@lru_cache(maxsize=8)
+def _ssl_context(cafile: Optional[str], certfile: Optional[str], keyfile: Optional[str]) -> ssl.SSLContext:
+    """Build (once per certificate set) the SSL context used by the Kafka clients.
+
+    Certificates are still verified; only the hostname check is disabled, as
+    the clients previously configured with ssl_check_hostname=False.
+    """
+    context = ssl.create_default_context(cafile=cafile)
+    context.check_hostname = False
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    if certfile:
+        context.load_cert_chain(certfile, keyfile)
+    return context
+
 
 @dataclass
 class TopicInfo:
@@ -42,9 +64,9 @@ class Message:
 class ProduceMessageRequest:
     """Request to produce a message."""
     topic: str
-    key: Optional[str] = None
-    value: str = ""
-    headers: Optional[Dict[str, str]] = None
+    key: Optional[Union[str, bytes]] = None
+    value: Union[str, bytes] = ""
+    headers: Optional[Dict[str, Union[str, bytes]]] = None
 
 
 @dataclass
@@ -72,6 +94,8 @@ class KafkaClient:
         self.admin_client: Optional[KafkaAdminClient] = None
         self.producer: Optional[KafkaProducer] = None
         self.consumer: Optional[KafkaConsumer] = None
+        # KafkaConsumer is not thread-safe; consume calls may arrive from worker threads
+        self._consumer_lock = threading.Lock()
         self._bootstrap_servers: List[str] = []
 
         # Initialize Knox client if enabled
@@ -112,7 +136,9 @@ class KafkaClient:
             'bootstrap_servers': self._bootstrap_servers,
             'client_id': kafka_config.client_id,
             'request_timeout_ms': kafka_config.timeout * 1000,
-            'api_version': (2, 6, 0),  # Use a more stable version
+            # Pinning the version skips the ApiVersions probe round trips
+            'api_version': kafka_config.api_version_tuple(),
+            'metadata_max_age_ms': kafka_config.metadata_max_age_ms,
         }
 
         # Configure security
@@ -125,24 +151,15 @@ class KafkaClient:
                 client_config['sasl_plain_password'] = kafka_config.sasl_password
 
             if kafka_config.security_protocol in ['SSL', 'SASL_SSL']:
-                client_config['ssl_check_hostname'] = False
-                if kafka_config.tls_ca_cert:
-                    client_config['ssl_cafile'] = kafka_config.tls_ca_cert
-                if kafka_config.tls_cert:
-                    client_config['ssl_certfile'] = kafka_config.tls_cert
-                if kafka_config.tls_key:
-                    client_config['ssl_keyfile'] = kafka_config.tls_key
-
-        # Create admin client with error handling
-        try:
-            admin_config = client_config.copy()
-            admin_config['metadata_max_age_ms'] = 30000  # Reduce metadata refresh
-            admin_config['retry_backoff_ms'] = 100
-            admin_config['reconnect_backoff_ms'] = 50
-            self.admin_client = KafkaAdminClient(**admin_config)
-        except Exception as e:
-            print(f"Warning: Admin client initialization failed: {e}")
-            self.admin_client = None
+                # One context shared by the admin client, producer and consumer
+                client_config['ssl_context'] = _ssl_context(
+                    kafka_config.tls_ca_cert, kafka_config.tls_cert, kafka_config.tls_key
+                )
+
+        # Admin client configuration
+        admin_config = client_config.copy()
+        admin_config['retry_backoff_ms'] = 100
+        admin_config['reconnect_backoff_ms'] = 50
 
         # Create producer with aggressive timeout settings
         producer_config = client_config.copy()
@@ -153,9 +170,9 @@ class KafkaClient:
         producer_config['request_timeout_ms'] = 5000  # Reduce request timeout
         producer_config['delivery_timeout_ms'] = 10000  # Reduce delivery timeout
         producer_config['acks'] = '1'  # Change from 'all' to '1' for faster response
-        producer_config['batch_size'] = 16384  # Smaller batch size
-        producer_config['linger_ms'] = 0  # No batching delay
-        self.producer = KafkaProducer(**producer_config)
+        producer_config.update(kafka_config.producer_batching())  # linger_ms / batch_size
+        if kafka_config.compression_type:
+            producer_config['compression_type'] = kafka_config.compression_type
 
         # Create consumer
         consumer_config = client_config.copy()
@@ -164,7 +181,35 @@ class KafkaClient:
         consumer_config['auto_offset_reset'] = 'earliest'
         consumer_config['enable_auto_commit'] = False
         consumer_config['consumer_timeout_ms'] = 5000
-        self.consumer = KafkaConsumer(**consumer_config)
+        consumer_config['fetch_min_bytes'] = kafka_config.fetch_min_bytes
+        consumer_config['fetch_max_wait_ms'] = kafka_config.fetch_max_wait_ms
+        consumer_config['fetch_max_bytes'] = kafka_config.fetch_max_bytes
+        consumer_config['max_poll_records'] = kafka_config.max_poll_records
+        if kafka_config.receive_buffer_bytes is not None:
+            consumer_config['receive_buffer_bytes'] = kafka_config.receive_buffer_bytes
+
+        # Each client bootstraps its own SASL/SSL connection; run the three
+        # handshakes concurrently instead of back to back
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            admin_future = executor.submit(KafkaAdminClient, **admin_config)
+            producer_future = executor.submit(KafkaProducer, **producer_config)
+            consumer_future = executor.submit(KafkaConsumer, **consumer_config)
+
+        # Admin client failures are tolerated; producer/consumer failures are not
+        try:
+            self.admin_client = admin_future.result()
+        except Exception as e:
+            print(f"Warning: Admin client initialization failed: {e}")
+            self.admin_client = None
+
+        error = producer_future.exception() or consumer_future.exception()
+        if error is not None:
+            for future in (admin_future, producer_future, consumer_future):
+                if future.exception() is None:
+                    future.result().close()
+            raise error
+        self.producer = producer_future.result()
+        self.consumer = consumer_future.result()
 
     def _list_topics_via_connect(self) -> List[str]:
         """List topics using Kafka Connect API as fallback."""
@@ -455,6 +500,40 @@ class KafkaClient:
         error_summary = "; ".join(errors)
         raise Exception(f"Failed to create topic {name}. All approaches failed: {error_summary}")
 
+    def create_topics(self, topics: List[Dict[str, Any]], batch_size: int = CREATE_TOPICS_BATCH_SIZE,
+                      validate_only: bool = False) -> Dict[str, Optional[str]]:
+        """Create several topics with one CreateTopics request per batch.
+
+        Each topic spec takes the create_topic arguments (name, partitions,
+        replication_factor, config). Returns the error for each topic, or None
+        for topics that were created. With validate_only the broker checks the
+        specs (names, partition counts, configs) without creating anything.
+        """
+        if self.admin_client is None:
+            raise Exception("Admin client not available")
+
+        new_topics = [
+            NewTopic(
+                name=spec['name'],
+                num_partitions=spec.get('partitions', 1),
+                replication_factor=spec.get('replication_factor', 1),
+                topic_configs=spec.get('config') or {}
+            )
+            for spec in topics
+        ]
+
+        results = {}
+        for start in range(0, len(new_topics), batch_size):
+            batch = new_topics[start:start + batch_size]
+            try:
+                response = self.admin_client.create_topics(batch, timeout_ms=60000, validate_only=validate_only)
+            except KafkaError as e:
+                raise Exception(f"Failed to create topics: {e}")
+            for topic_error in response.topic_errors:
+                topic, error_code = topic_error[0], topic_error[1]
+                results[topic] = None if error_code == 0 else for_code(error_code).__name__
+        return results
+
     def _describe_topic_via_fallback(self, name: str) -> TopicInfo:
         """Fallback method to describe topic when admin_client is not available."""
         try:
@@ -546,9 +625,14 @@ class KafkaClient:
                 raise Exception(f"Failed to check if topic exists: {e}")
         
         try:
-            metadata = self.admin_client.list_topics()
-            return name in metadata.topics
-        except KafkaError as e:
+            # Fetch metadata for this one topic rather than the whole cluster
+            topics = self.admin_client.describe_topics([name])
+            # kafka-python keys the topic by 'name'; older releases used 'topic'
+            return any(topic.get('name', topic.get('topic')) == name and topic.get('error_code') == 0
+                       for topic in topics)
+        except UnknownTopicOrPartitionError:
+            return False
+        except Exception as e:
             raise Exception(f"Failed to check if topic exists: {e}")
 
     def get_topic_partitions(self, name: str) -> int:
@@ -627,10 +711,11 @@ class KafkaClient:
         """Produce message using direct Kafka producer."""
         try:
             # Prepare headers
+            # Header values that are already bytes are passed through as-is
             headers = []
             if request.headers:
                 for key, value in request.headers.items():
-                    headers.append((key, value.encode('utf-8')))
+                    headers.append((key, value if isinstance(value, bytes) else value.encode('utf-8')))
 
             # Send message
             future = self.producer.send(
@@ -755,45 +840,54 @@ class KafkaClient:
 
     def consume_messages(self, request: ConsumeMessageRequest) -> List[Message]:
         """Consume messages from a topic."""
+        with self._consumer_lock:
+            return self._consume_messages(request)
+
+    def _consume_messages(self, request: ConsumeMessageRequest) -> List[Message]:
+        """Consume messages from a topic; callers must hold _consumer_lock."""
         try:
             # Subscribe to topic
             self.consumer.subscribe([request.topic])
 
             messages = []
-            start_time = time.time()
-
-            for message in self.consumer:
-                # Check timeout
-                if time.time() - start_time > request.timeout:
-                    break
+            deadline = time.monotonic() + request.timeout
 
-                # Check max count
-                if len(messages) >= request.max_count:
+            # Poll in batches (up to the records still wanted) until max_count
+            # messages are collected or the timeout runs out
+            while len(messages) < request.max_count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     break
-
-                # Filter by partition if specified
-                if request.partition is not None and message.partition != request.partition:
-                    continue
-
-                # Filter by offset if specified
-                if request.offset > 0 and message.offset < request.offset:
-                    continue
-
-                # Convert headers
-                headers = {}
-                if message.headers:
-                    for key, value in message.headers:
-                        headers[key] = value.decode('utf-8') if isinstance(value, bytes) else value
-
-                messages.append(Message(
-                    topic=message.topic,
-                    partition=message.partition,
-                    offset=message.offset,
-                    key=message.key,
-                    value=message.value,
-                    headers=headers,
-                    timestamp=datetime.fromtimestamp(message.timestamp / 1000) if message.timestamp else datetime.now()
-                ))
+                batches = self.consumer.poll(
+                    timeout_ms=int(remaining * 1000),
+                    max_records=request.max_count - len(messages)
+                )
+
+                for records in batches.values():
+                    for message in records:
+                        # Filter by partition if specified
+                        if request.partition is not None and message.partition != request.partition:
+                            continue
+
+                        # Filter by offset if specified
+                        if request.offset > 0 and message.offset < request.offset:
+                            continue
+
+                        # Convert headers
+                        headers = {}
+                        if message.headers:
+                            for key, value in message.headers:
+                                headers[key] = value.decode('utf-8') if isinstance(value, bytes) else value
+
+                        messages.append(Message(
+                            topic=message.topic,
+                            partition=message.partition,
+                            offset=message.offset,
+                            key=message.key,
+                            value=message.value,
+                            headers=headers,
+                            timestamp=datetime.fromtimestamp(message.timestamp / 1000) if message.timestamp else datetime.now()
+                        ))
 
             return messages
 
@@ -859,7 +953,7 @@ class KafkaClient:
         else:
             bootstrap_server = self.config.kafka.bootstrap_servers.split(',')[0]
         
-        host = bootstrap_server.split(':')[0]
+        host, _ = parse_bootstrap_server(bootstrap_server)
         return f"http://{host}:28083"
 
     def _make_connect_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -304,6 +304,10 @@ class KnoxGatewayClient:
             health_info["overall_health"] = "unhealthy"
         
         return health_info
+    
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
 
 
 class KnoxKafkaClient:
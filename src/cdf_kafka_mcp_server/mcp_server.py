@@ -2,6 +2,7 @@
 MCP server implementation for CDF Kafka MCP Server.
 """
 
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -19,7 +20,7 @@ from mcp.types import (
     EmbeddedResource,
 )
 
-from .config import load_config
+from .config import load_config, parse_bootstrap_server
 from .kafka_client import KafkaClient, ProduceMessageRequest, ConsumeMessageRequest
 from .cdp_kafka_client import CDPKafkaClient
 from .cdp_rest_client import CDPRestClient
@@ -67,11 +68,8 @@ class CDFKafkaMCPServer:
         if hasattr(self.config, 'kafka') and self.config.kafka.bootstrap_servers:
             try:
                 # Extract base URL from bootstrap servers
-                bootstrap_server = self.config.kafka.bootstrap_servers[0]
-                if ':' in bootstrap_server:
-                    base_url = f"https://{bootstrap_server.split(':')[0]}:{bootstrap_server.split(':')[1]}"
-                else:
-                    base_url = f"https://{bootstrap_server}"
+                host, port = parse_bootstrap_server(self.config.kafka.bootstrap_servers[0])
+                base_url = f"https://{host}:{port}" if port else f"https://{host}"
                 
                 # Get custom endpoints from configuration if available
                 custom_endpoints = None
@@ -151,6 +149,17 @@ class CDFKafkaMCPServer:
         """Get the CDP REST client."""
         return self.cdp_rest_client
 
+    def close(self) -> None:
+        """Close the clients (and their connection pools) held for the server's lifetime."""
+        for client in (self.kafka_client, self.cdp_kafka_client, self.cdp_rest_client,
+                       self.knox_gateway_client, self.cdp_client):
+            if client is None:
+                continue
+            try:
+                client.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to close {type(client).__name__}: {e}")
+
     def _setup_logging(self) -> logging.Logger:
         """Set up logging configuration."""
         logger = logging.getLogger("cdf_kafka_mcp_server")
@@ -487,6 +496,31 @@ class CDFKafkaMCPServer:
                     "required": []
                 }
             ),
+            # Batch Tools
+            Tool(
+                name="batch_execute",
+                description="Run several tool calls in one request and return their results in order",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "calls": {
+                            "type": "array",
+                            "description": "Tool calls to run",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "name": {"type": "string", "description": "Tool name"},
+                                    "arguments": {"type": "object", "description": "Tool arguments"}
+                                },
+                                "required": ["name"]
+                            }
+                        },
+                        "maxConcurrent": {"type": "integer", "description": "Maximum calls run at once", "default": 8},
+                        "stopOnError": {"type": "boolean", "description": "Skip calls not yet started once one fails", "default": False}
+                    },
+                    "required": ["calls"]
+                }
+            ),
         ]
 
         # Add Knox-specific tools if enabled
@@ -697,109 +731,7 @@ class CDFKafkaMCPServer:
             
             self.logger.info(f"Calling tool: {tool_name}")
 
-            # Route to appropriate handler
-            if tool_name == "list_topics":
-                result = await self._handle_list_topics(arguments)
-            elif tool_name == "create_topic":
-                result = await self._handle_create_topic(arguments)
-            elif tool_name == "describe_topic":
-                result = await self._handle_describe_topic(arguments)
-            elif tool_name == "delete_topic":
-                result = await self._handle_delete_topic(arguments)
-            elif tool_name == "topic_exists":
-                result = await self._handle_topic_exists(arguments)
-            elif tool_name == "get_topic_partitions":
-                result = await self._handle_get_topic_partitions(arguments)
-            elif tool_name == "update_topic_config":
-                result = await self._handle_update_topic_config(arguments)
-            elif tool_name == "produce_message":
-                result = await self._handle_produce_message(arguments)
-            elif tool_name == "consume_messages":
-                result = await self._handle_consume_messages(arguments)
-            elif tool_name == "get_topic_offsets":
-                result = await self._handle_get_topic_offsets(arguments)
-            elif tool_name == "get_broker_info":
-                result = await self._handle_get_broker_info(arguments)
-            elif tool_name == "get_cluster_metadata":
-                result = await self._handle_get_cluster_metadata(arguments)
-            elif tool_name == "test_connection":
-                result = await self._handle_test_connection(arguments)
-            elif tool_name == "list_connectors":
-                result = await self._handle_list_connectors(arguments)
-            elif tool_name == "create_connector":
-                result = await self._handle_create_connector(arguments)
-            elif tool_name == "get_connector":
-                result = await self._handle_get_connector(arguments)
-            elif tool_name == "get_connector_status":
-                result = await self._handle_get_connector_status(arguments)
-            elif tool_name == "get_connector_config":
-                result = await self._handle_get_connector_config(arguments)
-            elif tool_name == "update_connector_config":
-                result = await self._handle_update_connector_config(arguments)
-            elif tool_name == "delete_connector":
-                result = await self._handle_delete_connector(arguments)
-            elif tool_name == "pause_connector":
-                result = await self._handle_pause_connector(arguments)
-            elif tool_name == "resume_connector":
-                result = await self._handle_resume_connector(arguments)
-            elif tool_name == "restart_connector":
-                result = await self._handle_restart_connector(arguments)
-            elif tool_name == "get_connector_tasks":
-                result = await self._handle_get_connector_tasks(arguments)
-            elif tool_name == "get_connector_active_topics":
-                result = await self._handle_get_connector_active_topics(arguments)
-            elif tool_name == "list_connector_plugins":
-                result = await self._handle_list_connector_plugins(arguments)
-            elif tool_name == "validate_connector_config":
-                result = await self._handle_validate_connector_config(arguments)
-            elif tool_name == "get_connect_server_info":
-                result = await self._handle_get_connect_server_info(arguments)
-            elif tool_name == "test_knox_connection":
-                result = await self._handle_test_knox_connection(arguments)
-            elif tool_name == "get_knox_metadata":
-                result = await self._handle_get_knox_metadata(arguments)
-            elif tool_name == "get_knox_gateway_info":
-                result = await self._handle_get_knox_gateway_info(arguments)
-            elif tool_name == "list_knox_topologies":
-                result = await self._handle_list_knox_topologies(arguments)
-            elif tool_name == "get_knox_topology":
-                result = await self._handle_get_knox_topology(arguments)
-            elif tool_name == "create_knox_topology":
-                result = await self._handle_create_knox_topology(arguments)
-            elif tool_name == "get_knox_service_health":
-                result = await self._handle_get_knox_service_health(arguments)
-            elif tool_name == "get_knox_service_urls":
-                result = await self._handle_get_knox_service_urls(arguments)
-            elif tool_name == "test_cdp_connection":
-                result = await self._handle_test_cdp_connection(arguments)
-            elif tool_name == "get_cdp_apis":
-                result = await self._handle_get_cdp_apis(arguments)
-            elif tool_name == "get_cdp_service_health":
-                result = await self._handle_get_cdp_service_health(arguments)
-            elif tool_name == "validate_cdp_token":
-                result = await self._handle_validate_cdp_token(arguments)
-            elif tool_name == "get_health_status":
-                result = await self._handle_get_health_status(arguments)
-            elif tool_name == "get_health_summary":
-                result = await self._handle_get_health_summary(arguments)
-            elif tool_name == "get_health_history":
-                result = await self._handle_get_health_history(arguments)
-            elif tool_name == "get_service_metrics":
-                result = await self._handle_get_service_metrics(arguments)
-            elif tool_name == "run_health_check":
-                result = await self._handle_run_health_check(arguments)
-            elif tool_name == "test_authentication":
-                result = await self._handle_test_authentication(arguments)
-            elif tool_name == "discover_auth_endpoints":
-                result = await self._handle_discover_auth_endpoints(arguments)
-            elif tool_name == "refresh_authentication":
-                result = await self._handle_refresh_authentication(arguments)
-            elif tool_name == "get_topic_info":
-                result = await self._handle_describe_topic(arguments)
-            elif tool_name == "get_cdp_clusters":
-                result = await self._handle_get_cdp_clusters(arguments)
-            else:
-                raise ValueError(f"Unknown tool: {tool_name}")
+            result = await self._dispatch(tool_name, arguments)
 
             return CallToolResult(
                 content=[TextContent(type="text", text=json.dumps(result, indent=2))]
@@ -811,6 +743,128 @@ class CDFKafkaMCPServer:
                 content=[TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
             )
 
+    async def call_tool_native(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Handle a tool call from an in-process caller, returning the result dict without JSON encoding.
+
+        Errors are reported the same way as call_tool, as {"error": message}.
+        """
+        try:
+            self.logger.info(f"Calling tool: {tool_name}")
+            return await self._dispatch(tool_name, arguments or {})
+        except Exception as e:
+            self.logger.error(f"Error in tool {tool_name}: {e}")
+            return {"error": str(e)}
+
+    async def _dispatch(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Route a tool call to its handler and return the handler's result."""
+        # Route to appropriate handler
+        if tool_name == "list_topics":
+            result = await self._handle_list_topics(arguments)
+        elif tool_name == "create_topic":
+            result = await self._handle_create_topic(arguments)
+        elif tool_name == "describe_topic":
+            result = await self._handle_describe_topic(arguments)
+        elif tool_name == "delete_topic":
+            result = await self._handle_delete_topic(arguments)
+        elif tool_name == "topic_exists":
+            result = await self._handle_topic_exists(arguments)
+        elif tool_name == "get_topic_partitions":
+            result = await self._handle_get_topic_partitions(arguments)
+        elif tool_name == "update_topic_config":
+            result = await self._handle_update_topic_config(arguments)
+        elif tool_name == "produce_message":
+            result = await self._handle_produce_message(arguments)
+        elif tool_name == "consume_messages":
+            result = await self._handle_consume_messages(arguments)
+        elif tool_name == "get_topic_offsets":
+            result = await self._handle_get_topic_offsets(arguments)
+        elif tool_name == "get_broker_info":
+            result = await self._handle_get_broker_info(arguments)
+        elif tool_name == "get_cluster_metadata":
+            result = await self._handle_get_cluster_metadata(arguments)
+        elif tool_name == "test_connection":
+            result = await self._handle_test_connection(arguments)
+        elif tool_name == "list_connectors":
+            result = await self._handle_list_connectors(arguments)
+        elif tool_name == "create_connector":
+            result = await self._handle_create_connector(arguments)
+        elif tool_name == "get_connector":
+            result = await self._handle_get_connector(arguments)
+        elif tool_name == "get_connector_status":
+            result = await self._handle_get_connector_status(arguments)
+        elif tool_name == "get_connector_config":
+            result = await self._handle_get_connector_config(arguments)
+        elif tool_name == "update_connector_config":
+            result = await self._handle_update_connector_config(arguments)
+        elif tool_name == "delete_connector":
+            result = await self._handle_delete_connector(arguments)
+        elif tool_name == "pause_connector":
+            result = await self._handle_pause_connector(arguments)
+        elif tool_name == "resume_connector":
+            result = await self._handle_resume_connector(arguments)
+        elif tool_name == "restart_connector":
+            result = await self._handle_restart_connector(arguments)
+        elif tool_name == "get_connector_tasks":
+            result = await self._handle_get_connector_tasks(arguments)
+        elif tool_name == "get_connector_active_topics":
+            result = await self._handle_get_connector_active_topics(arguments)
+        elif tool_name == "list_connector_plugins":
+            result = await self._handle_list_connector_plugins(arguments)
+        elif tool_name == "validate_connector_config":
+            result = await self._handle_validate_connector_config(arguments)
+        elif tool_name == "get_connect_server_info":
+            result = await self._handle_get_connect_server_info(arguments)
+        elif tool_name == "test_knox_connection":
+            result = await self._handle_test_knox_connection(arguments)
+        elif tool_name == "get_knox_metadata":
+            result = await self._handle_get_knox_metadata(arguments)
+        elif tool_name == "get_knox_gateway_info":
+            result = await self._handle_get_knox_gateway_info(arguments)
+        elif tool_name == "list_knox_topologies":
+            result = await self._handle_list_knox_topologies(arguments)
+        elif tool_name == "get_knox_topology":
+            result = await self._handle_get_knox_topology(arguments)
+        elif tool_name == "create_knox_topology":
+            result = await self._handle_create_knox_topology(arguments)
+        elif tool_name == "get_knox_service_health":
+            result = await self._handle_get_knox_service_health(arguments)
+        elif tool_name == "get_knox_service_urls":
+            result = await self._handle_get_knox_service_urls(arguments)
+        elif tool_name == "test_cdp_connection":
+            result = await self._handle_test_cdp_connection(arguments)
+        elif tool_name == "get_cdp_apis":
+            result = await self._handle_get_cdp_apis(arguments)
+        elif tool_name == "get_cdp_service_health":
+            result = await self._handle_get_cdp_service_health(arguments)
+        elif tool_name == "validate_cdp_token":
+            result = await self._handle_validate_cdp_token(arguments)
+        elif tool_name == "get_health_status":
+            result = await self._handle_get_health_status(arguments)
+        elif tool_name == "get_health_summary":
+            result = await self._handle_get_health_summary(arguments)
+        elif tool_name == "get_health_history":
+            result = await self._handle_get_health_history(arguments)
+        elif tool_name == "get_service_metrics":
+            result = await self._handle_get_service_metrics(arguments)
+        elif tool_name == "run_health_check":
+            result = await self._handle_run_health_check(arguments)
+        elif tool_name == "test_authentication":
+            result = await self._handle_test_authentication(arguments)
+        elif tool_name == "discover_auth_endpoints":
+            result = await self._handle_discover_auth_endpoints(arguments)
+        elif tool_name == "refresh_authentication":
+            result = await self._handle_refresh_authentication(arguments)
+        elif tool_name == "get_topic_info":
+            result = await self._handle_describe_topic(arguments)
+        elif tool_name == "get_cdp_clusters":
+            result = await self._handle_get_cdp_clusters(arguments)
+        elif tool_name == "batch_execute":
+            result = await self._handle_batch_execute(arguments)
+        else:
+            raise ValueError(f"Unknown tool: {tool_name}")
+
+        return result
+
     # Tool Handlers
 
     async def _handle_list_topics(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -1004,11 +1058,11 @@ class CDFKafkaMCPServer:
             try:
                 topics = cdp_rest_client.get_topics()
                 if isinstance(topics, list):
-                    topic_names = [topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics]
+                    topic_names = frozenset(topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics)
                 elif isinstance(topics, dict) and 'topics' in topics:
-                    topic_names = [topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics['topics']]
+                    topic_names = frozenset(topic.get('name', topic) if isinstance(topic, dict) else str(topic) for topic in topics['topics'])
                 else:
-                    topic_names = []
+                    topic_names = frozenset()
                 exists = name in topic_names
                 return {
                     "topic": name,
@@ -1177,7 +1231,9 @@ class CDFKafkaMCPServer:
                     value=value,
                     headers=headers
                 )
-                message = self.kafka_client.produce_message(request)
+                # Wait for the broker ack off the event loop so concurrent
+                # produce calls overlap and the producer can batch them
+                message = await asyncio.to_thread(self.kafka_client.produce_message, request)
                 return {
                     "topic": message.topic,
                     "partition": message.partition,
@@ -1230,7 +1286,7 @@ class CDFKafkaMCPServer:
                     max_count=max_count,
                     timeout=timeout
                 )
-                messages = self.kafka_client.consume_messages(request)
+                messages = await asyncio.to_thread(self.kafka_client.consume_messages, request)
                 return {
                     "messages": [
                         {
@@ -1886,6 +1942,37 @@ class CDFKafkaMCPServer:
             "error": "No CDP REST client available"
         }
 
+    async def _handle_batch_execute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle batch_execute tool - run several tool calls concurrently in one request."""
+        calls = arguments["calls"]
+        semaphore = asyncio.Semaphore(max(1, int(arguments.get("maxConcurrent", 8))))
+        stop_on_error = bool(arguments.get("stopOnError", False))
+        failed = asyncio.Event()
+
+        async def run_call(call: Dict[str, Any]) -> Dict[str, Any]:
+            name = call.get("name")
+            async with semaphore:
+                if stop_on_error and failed.is_set():
+                    return {"name": name, "skipped": True}
+                try:
+                    if name == "batch_execute":
+                        raise ValueError("batch_execute cannot be nested")
+                    result = await self._dispatch(name, call.get("arguments") or {})
+                except Exception as e:
+                    self.logger.error(f"Error in batched tool {name}: {e}")
+                    result = {"error": str(e)}
+                if isinstance(result, dict) and "error" in result:
+                    failed.set()
+                return {"name": name, "result": result}
+
+        results = await asyncio.gather(*(run_call(call) for call in calls))
+        return {
+            "results": results,
+            "count": len(results),
+            "failed": sum(1 for entry in results if "error" in entry.get("result", {})),
+            "skipped": sum(1 for entry in results if entry.get("skipped"))
+        }
+
     async def run(self) -> None:
         """Run the MCP server."""
         self.logger.info("Starting CDF Kafka MCP Server...")